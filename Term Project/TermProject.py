@@ -1,97 +1,881 @@
+import hashlib
+import mmap
+import os
 import re
+import sys
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import islice
+from pathlib import Path
 
+import numpy as np
 
-def load_and_clean_data(raw_data_string):
+from rolling_stats import analyze_rolling_windows, infer_start_year
+
+
+# One hour of cleaned LCD data. Defined at module level so records can be
+# shared between the streaming, batch and in-memory loaders.
+DataRecord = namedtuple('DataRecord', [
+    'Month', 'Day', 'Time', 'Temp', 'Precip', 'WindSpeed', 'WindGust'
+])
+
+# Column-oriented counterpart of DataRecord: one typed NumPy array per field.
+# Time is stored as an HHMM integer (e.g. '0853' -> 853) to keep it compact.
+LCDColumns = namedtuple('LCDColumns', DataRecord._fields)
+
+# NumPy dtype used for each column of LCDColumns
+COLUMN_DTYPES = {
+    'Month': np.uint8,
+    'Day': np.uint8,
+    'Time': np.int16,
+    'Temp': np.int16,
+    'Precip': np.float64,
+    'WindSpeed': np.uint8,
+    'WindGust': np.uint8,
+}
+
+# Version of the parsing rules. Bump this whenever parsing or cleaning changes
+# so that cached LCD data from older versions is ignored.
+PARSER_VERSION = 1
+
+# Regex to capture the required columns. It's designed to be flexible
+# with the spacing and structure of the fixed-width-like text format.
+# It captures:
+# 1: Month, 2: Day, 3: Time
+# 4: Dry Bulb Temp
+# 5: Wind Speed
+# 6: Wind Gust (optional)
+# 7: Precip Total
+LINE_PATTERN = re.compile(
+    r"^\s*(\d{2})\s+(\d{2})\s+(\d{4})\s+.*?"  # 1:Month, 2:Day, 3:Time
+    r"\s+(\d{1,3})\s+\d{1,3}\.\d\s+"  # 4:Dry Bulb Temp (F)
+    r".*?\s+(\d{1,2}|VRB)\s+[\dVRB]{3}\s+"  # 5:Wind Speed (MPH)
+    r"(\d{1,2})?\s+.*?"  # 6:Wind Gusts (MPH) - optional
+    r"FM-\d{2}\s+(T|[\d\.]+|)\s+.*"  # 7:Precip Total (in)
+)
+
+
+# Matches the whitespace-separated tokens of a line (used only for lines with
+# irregular spacing, to recover the width of each gap between tokens)
+TOKEN_PATTERN = re.compile(r"\S+")
+
+# Characters allowed in the 3-character wind direction column
+WIND_DIRECTION_CHARS = frozenset('0123456789VRB')
+
+# Column patterns for the single-spaced fast path. Each one spans a fixed run
+# of whole tokens, so unlike LINE_PATTERN it can't backtrack across the line:
+# dry bulb temperature (F) followed by the Celsius value, wind speed with
+# direction and gust, and the report type with its precipitation total
+TEMPERATURE_COLUMNS = re.compile(r" (\d{1,3}) \d{1,3}\.\d ")
+WIND_COLUMNS = re.compile(r" (\d{1,2}|VRB) [\dVRB]{3} (\d{1,2}) ")
+REPORT_TYPE_COLUMNS = re.compile(r"FM-\d{2} (T|[\d.]+) ")
+
+
+def _clean_fields(month_str, day_str, time_str, temp_str, wind_speed_str, wind_gust_str, precip_str):
+    """
+    Converts the raw text fields captured from one line into a DataRecord.
+
+    Returns:
+        DataRecord: The cleaned record, or None if a field cannot be converted.
+    """
+    try:
+        # Clean and convert data types
+        month = int(month_str)
+        day = int(day_str)
+        temp = int(temp_str)
+
+        # Precipitation: handle 'T' for trace and empty values
+        precip = 0.0 if precip_str.upper() == 'T' or not precip_str else float(precip_str)
+
+        # Wind Speed: handle non-numeric values like 'VRB'
+        wind_speed = 0 if not wind_speed_str.isdigit() else int(wind_speed_str)
+
+        # Wind Gust: handle missing values
+        wind_gust = 0 if not wind_gust_str or not wind_gust_str.isdigit() else int(wind_gust_str)
+
+        return DataRecord(month, day, time_str, temp, precip, wind_speed, wind_gust)
+
+    except (ValueError, IndexError):
+        # Skip lines that do not conform to the expected format after matching
+        return None
+
+
+def parse_line_regex(line):
+    """
+    Parses and cleans a single line of raw LCD text with LINE_PATTERN.
+
+    This is the reference implementation that parse_line must agree with.
+
+    Args:
+        line (str): One line of raw weather data.
+
+    Returns:
+        DataRecord: The cleaned record, or None if the line does not match
+        the expected format.
+    """
+    match = LINE_PATTERN.match(line)
+    if not match:
+        return None
+
+    return _clean_fields(*match.groups())
+
+
+def _is_digits(token, min_length, max_length):
+    """
+    Checks whether a token is made of min_length to max_length digits.
+    """
+    return min_length <= len(token) <= max_length and token.isdecimal()
+
+
+def _split_fields(tokens, wide_gaps, trailing_space):
+    """
+    Locates the LINE_PATTERN fields in a tokenized line.
+
+    The search visits candidate positions in the same order LINE_PATTERN
+    backtracks through them, so it captures exactly the same fields, but it
+    works on whole tokens and anchors directly on the FM-xx report type.
+
+    Args:
+        tokens (list): The whitespace-separated tokens of the line.
+        wide_gaps (set): Indexes of tokens preceded by two or more whitespace
+            characters (len(tokens) stands for trailing whitespace).
+        trailing_space (bool): Whether the line ends in whitespace.
+
+    Returns:
+        tuple: The seven captured text fields, or None if the line does not match.
+    """
+    token_count = len(tokens)
+
+    def followed_by_space(index):
+        return index + 1 < token_count or trailing_space
+
+    # Month, day and time are always the first three columns
+    if (token_count < 3 or not _is_digits(tokens[0], 2, 2) or not _is_digits(tokens[1], 2, 2)
+            or not _is_digits(tokens[2], 4, 4) or not followed_by_space(2)):
+        return None
+
+    # Anchor on the report type: every token ending in FM-xx whose following
+    # precipitation column is usable, mapped to its captured precipitation
+    report_types = {}
+    for index in range(4, token_count):
+        token = tokens[index]
+        if not (len(token) >= 5 and token[-5:-2] == 'FM-' and token[-2:].isdecimal()
+                and followed_by_space(index)):
+            continue
+
+        precip_index = index + 1
+        if precip_index < token_count and followed_by_space(precip_index):
+            precip = tokens[precip_index]
+            if precip == 'T' or not precip.replace('.', '') or precip.replace('.', '').isdecimal():
+                report_types[index] = precip
+                continue
+        if precip_index in wide_gaps:
+            report_types[index] = ''
+
+    if not report_types:
+        return None
+    last_report_type = max(report_types)
+
+    # LINE_PATTERN's greedy '\s+' only gives up part of a wide gap after its
+    # lazy '.*?' has tried every later column, so a field right after a wide
+    # gap is considered last rather than first
+    temp_candidates = list(range(4, token_count - 1))
+    if 3 in wide_gaps:
+        temp_candidates.append(3)
+
+    for temp_index in temp_candidates:
+        # Dry bulb temperature (F) is an integer followed by the Celsius value
+        # with one decimal place
+        celsius = tokens[temp_index + 1]
+        if not (_is_digits(tokens[temp_index], 1, 3) and 3 <= len(celsius) <= 5
+                and celsius[-2] == '.' and celsius[-1].isdecimal()
+                and _is_digits(celsius[:-2], 1, 3) and followed_by_space(temp_index + 1)):
+            continue
+
+        wind_candidates = list(range(temp_index + 3, last_report_type - 1))
+        if temp_index + 2 in wide_gaps:
+            wind_candidates.append(temp_index + 2)
+
+        for wind_index in wind_candidates:
+            if wind_index + 2 > last_report_type:
+                continue
+            wind_speed = tokens[wind_index]
+            direction = tokens[wind_index + 1]
+            if not ((_is_digits(wind_speed, 1, 2) or wind_speed == 'VRB')
+                    and len(direction) == 3 and WIND_DIRECTION_CHARS.issuperset(direction)
+                    and followed_by_space(wind_index + 1)):
+                continue
+
+            # Wind gust present: the report type comes after the gust column
+            gust_index = wind_index + 2
+            if _is_digits(tokens[gust_index], 1, 2) and followed_by_space(gust_index):
+                for index in range(gust_index + 1, last_report_type + 1):
+                    if index in report_types:
+                        return (tokens[0], tokens[1], tokens[2], tokens[temp_index], wind_speed,
+                                tokens[gust_index], report_types[index])
+
+            # Wind gust missing: only possible where the column is left blank
+            if gust_index in wide_gaps:
+                for index in range(gust_index, last_report_type + 1):
+                    if index in report_types:
+                        return (tokens[0], tokens[1], tokens[2], tokens[temp_index], wind_speed,
+                                None, report_types[index])
+
+    return None
+
+
+def _split_regular_fields(text):
+    """
+    Fast path of _split_fields for lines whose tokens are separated by single
+    spaces, which is how LCD exports are written.
+
+    Without wide gaps the wind gust column can't be blank and every field
+    must be separated from the one before it, so each column is found with
+    one forward search that starts where the previous column ended.
+
+    Args:
+        text (str): The line without leading whitespace and with at most one
+            trailing space.
+
+    Returns:
+        tuple: The seven captured text fields, or None if the line does not match.
+    """
+    # Month, day and time are always the first three columns: 'MM DD HHMM '
+    if not (len(text) > 11 and text[2] == ' ' and text[5] == ' ' and text[10] == ' '
+            and text[:2].isdecimal() and text[3:5].isdecimal() and text[6:10].isdecimal()):
+        return None
+
+    # The temperature can't start before the fifth column
+    column_four_end = text.find(' ', 11)
+    if column_four_end == -1:
+        return None
+
+    temp_match = TEMPERATURE_COLUMNS.search(text, column_four_end)
+    if not temp_match:
+        return None
+
+    # The wind columns start at least one column after the Celsius value. Any
+    # later temperature would only see a subset of the same wind columns, so
+    # only the first temperature needs to be tried
+    wind_search_start = text.find(' ', temp_match.end())
+    if wind_search_start == -1:
+        return None
+    wind_match = WIND_COLUMNS.search(text, wind_search_start)
+    if not wind_match:
+        return None
+
+    # The report type can be anywhere after the wind gust
+    report_match = REPORT_TYPE_COLUMNS.search(text, wind_match.end())
+    if not report_match:
+        return None
+
+    return (text[:2], text[3:5], text[6:10], temp_match.group(1), wind_match.group(1),
+            wind_match.group(2), report_match.group(1))
+
+
+def parse_line(line):
+    """
+    Parses and cleans a single line of raw LCD text.
+
+    The line is split on whitespace and the columns are located around the
+    FM-xx report type, which avoids the heavy backtracking LINE_PATTERN does
+    on long or non-matching lines. The result is identical to parse_line_regex.
+
+    Args:
+        line (str): One line of raw weather data.
+
+    Returns:
+        DataRecord: The cleaned record, or None if the line does not match
+        the expected format.
+    """
+    # Cheap rejections before any tokenizing
+    if 'FM-' not in line:
+        return None
+    if '\n' in line:
+        # '.' in LINE_PATTERN cannot cross a line break; leave this to the regex
+        return parse_line_regex(line)
+
+    stripped = line.strip()
+
+    if '  ' not in stripped and stripped.isprintable() and not line[-2:].isspace():
+        # Single spaces between tokens and at most one trailing whitespace
+        fields = _split_regular_fields(stripped + ' ' if line[-1:].isspace() else stripped)
+    else:
+        # Irregular spacing: record which tokens follow a gap of two or more
+        # whitespace characters, since LINE_PATTERN treats those differently
+        tokens = stripped.split()
+        wide_gaps = set()
+        previous_end = None
+        for index, token_match in enumerate(TOKEN_PATTERN.finditer(line)):
+            if previous_end is not None and token_match.start() - previous_end >= 2:
+                wide_gaps.add(index)
+            previous_end = token_match.end()
+        if line[-2:].isspace():
+            wide_gaps.add(len(tokens))
+
+        fields = _split_fields(tokens, wide_gaps, line[-1:].isspace())
+
+    if fields is None:
+        return None
+
+    return _clean_fields(*fields)
+
+
+def iter_clean_records(lines, parser=parse_line):
+    """
+    Lazily parses and cleans LCD lines, one record at a time.
+
+    Only the current line is held in memory, so this works on an open file
+    or any other iterator of lines regardless of how large the archive is.
+
+    Args:
+        lines (iterable): An iterable of raw text lines, e.g. an open file.
+        parser (callable): The line parser, parse_line or parse_line_regex.
+
+    Yields:
+        DataRecord: One cleaned record for every line that matches.
+    """
+    for line in lines:
+        # File iteration keeps the line terminator; drop it so a line parses
+        # the same way as it does from load_and_clean_data
+        record = parser(line.rstrip('\n'))
+        if record is not None:
+            yield record
+
+
+def iter_record_batches(lines, batch_size=10000):
+    """
+    Lazily parses LCD lines and groups the cleaned records into batches.
+
+    Args:
+        lines (iterable): An iterable of raw text lines, e.g. an open file.
+        batch_size (int): The maximum number of records per batch.
+
+    Yields:
+        list: Lists of at most batch_size DataRecords.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    records = iter_clean_records(lines)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_lcd_file(path, batch_size=None, encoding='utf-8'):
+    """
+    Streams cleaned records from an LCD text file on disk.
+
+    The file is read line by line and closed once the generator is exhausted,
+    so memory use stays flat no matter how large the file is.
+
+    Args:
+        path (str or Path): The path to the raw LCD text file.
+        batch_size (int): If given, yield lists of this many records instead
+            of single records.
+        encoding (str): The text encoding of the file.
+
+    Yields:
+        DataRecord or list: Single records, or batches when batch_size is set.
+    """
+    with open(path, 'r', encoding=encoding) as lcd_file:
+        if batch_size is None:
+            yield from iter_clean_records(lcd_file)
+        else:
+            yield from iter_record_batches(lcd_file, batch_size)
+
+
+def iter_mmap_lines(path, marker=b'FM-', encoding='utf-8', block_size=1 << 22):
+    """
+    Memory-maps an LCD text file and yields only the lines containing a marker.
+
+    The file is scanned in place one block (cut at a line boundary) at a
+    time, so at most one block is ever copied out of the map. Lines are
+    checked for the marker as raw bytes and only the lines that contain it
+    are decoded. The encoding must be ASCII-compatible (e.g. UTF-8 or
+    Windows-1252).
+
+    Args:
+        path (str or Path): The path to the raw LCD text file.
+        marker (bytes): The bytes a line must contain to be yielded.
+        encoding (str): The text encoding of the file.
+        block_size (int): The approximate number of bytes scanned per block.
+
+    Yields:
+        str: Each matching line, without its line terminator.
+    """
+    with open(path, 'rb') as lcd_file:
+        if os.fstat(lcd_file.fileno()).st_size == 0:
+            # Empty files can't be memory-mapped
+            return
+
+        with mmap.mmap(lcd_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            block_start = 0
+            while block_start < size:
+                # Extend the block to the end of the line it stops in
+                block_end = mapped.find(b'\n', min(block_start + block_size, size))
+                if block_end == -1:
+                    block_end = size
+
+                for raw_line in mapped[block_start:block_end].split(b'\n'):
+                    if marker in raw_line:
+                        yield raw_line.decode(encoding).rstrip('\r')
+
+                block_start = block_end + 1
+
+
+def stream_lcd_mmap(path, batch_size=None, encoding='utf-8'):
+    """
+    Streams cleaned records from a memory-mapped LCD text file.
+
+    This behaves like stream_lcd_file, but the file is never read into
+    Python strings as a whole; only lines containing an FM-xx report type
+    (which every parsable line has) are decoded and parsed.
+
+    Args:
+        path (str or Path): The path to the raw LCD text file.
+        batch_size (int): If given, yield lists of this many records instead
+            of single records.
+        encoding (str): The text encoding of the file.
+
+    Yields:
+        DataRecord or list: Single records, or batches when batch_size is set.
+    """
+    lines = iter_mmap_lines(path, encoding=encoding)
+    if batch_size is None:
+        yield from iter_clean_records(lines)
+    else:
+        yield from iter_record_batches(lines, batch_size)
+
+
+def records_to_columns(records, batch_size=100000):
+    """
+    Converts an iterable of DataRecords into typed NumPy column arrays.
+
+    Records are converted one batch at a time, so a streaming iterator (for
+    example from stream_lcd_file) never has to be materialized as a list.
+
+    Args:
+        records (iterable): An iterable of data record NamedTuples.
+        batch_size (int): The number of records converted per batch.
+
+    Returns:
+        LCDColumns: A NamedTuple of NumPy arrays, one per DataRecord field.
+    """
+    chunks = {field: [] for field in DataRecord._fields}
+    records = iter(records)
+
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        # Transpose the batch of rows into one tuple per field
+        for field, values in zip(DataRecord._fields, zip(*batch)):
+            if field == 'Time':
+                values = [int(value) for value in values]
+            chunks[field].append(np.array(values, dtype=COLUMN_DTYPES[field]))
+
+    return LCDColumns(*[
+        np.concatenate(chunks[field]) if chunks[field] else np.empty(0, dtype=COLUMN_DTYPES[field])
+        for field in DataRecord._fields
+    ])
+
+
+def _file_digest(path):
+    """
+    Computes the SHA-256 hash of a file's contents, reading it in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source_file:
+        for chunk in iter(lambda: source_file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_lcd_file_cached(path, cache_dir=None):
+    """
+    Loads the cleaned LCD data of a file as LCDColumns, using an on-disk cache.
+
+    The parsed columns are stored as a NumPy .npz file keyed by the SHA-256
+    hash of the source file's contents and PARSER_VERSION, so repeat runs
+    over an unchanged file skip parsing entirely. Changing the file (or the
+    parser version) simply produces a new cache entry.
+
+    Args:
+        path (str or Path): The path to the raw LCD text file.
+        cache_dir (str or Path): The directory holding cache files (defaults
+            to a '.lcd_cache' directory next to the source file).
+
+    Returns:
+        LCDColumns: A NamedTuple of NumPy arrays, one per DataRecord field.
+    """
+    path = Path(path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else path.parent / '.lcd_cache'
+    cache_path = cache_dir / f"{path.stem}-{_file_digest(path)[:32]}-v{PARSER_VERSION}.npz"
+
+    if cache_path.exists():
+        with np.load(cache_path) as cached:
+            return LCDColumns(*[cached[field] for field in DataRecord._fields])
+
+    columns = records_to_columns(stream_lcd_mmap(path))
+
+    # Write to a temporary file first so an interrupted run (or a parallel
+    # worker) never leaves a partial cache file behind
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(temp_path, **columns._asdict())
+    os.replace(temp_path, cache_path)
+
+    return columns
+
+
+def load_and_clean_data(raw_data_string, columnar=False):
     """
     Parses raw LCD text data from a multiline string, cleans it, and structures it.
 
-    This function iterates through lines of raw weather data, uses regular expressions
-    to robustly parse relevant fields, handles data quality issues like trace
-    precipitation ('T') and non-numeric wind speeds, and converts values to
-    appropriate numeric types.
+    This function iterates through lines of raw weather data, uses a whitespace
+    tokenizer anchored on the FM-xx report type (see parse_line) to robustly parse
+    relevant fields, handles data quality issues like trace precipitation ('T')
+    and non-numeric wind speeds, and converts values to appropriate numeric types.
+    For archives too large to hold in memory, use stream_lcd_file or
+    iter_clean_records instead.
 
     Args:
         raw_data_string (str): A multiline string containing the raw weather data.
+        columnar (bool): If True, return typed NumPy column arrays instead of
+            a list of records.
 
     Returns:
         list: A list of NamedTuples, where each tuple represents an hour of cleaned data.
+            If columnar is True, an LCDColumns NamedTuple of NumPy arrays instead.
     """
-    DataRecord = namedtuple('DataRecord', [
-        'Month', 'Day', 'Time', 'Temp', 'Precip', 'WindSpeed', 'WindGust'
-    ])
+    records = iter_clean_records(raw_data_string.strip().split('\n'))
+    if columnar:
+        return records_to_columns(records)
+    return list(records)
 
-    cleaned_data = []
-    lines = raw_data_string.strip().split('\n')
-
-    # Regex to capture the required columns. It's designed to be flexible
-    # with the spacing and structure of the fixed-width-like text format.
-    # It captures:
-    # 1: Month, 2: Day, 3: Time
-    # 4: Dry Bulb Temp
-    # 5: Wind Speed
-    # 6: Wind Gust (optional)
-    # 7: Precip Total
-    line_pattern = re.compile(
-        r"^\s*(\d{2})\s+(\d{2})\s+(\d{4})\s+.*?"  # 1:Month, 2:Day, 3:Time
-        r"\s+(\d{1,3})\s+\d{1,3}\.\d\s+"  # 4:Dry Bulb Temp (F)
-        r".*?\s+(\d{1,2}|VRB)\s+[\dVRB]{3}\s+"  # 5:Wind Speed (MPH)
-        r"(\d{1,2})?\s+.*?"  # 6:Wind Gusts (MPH) - optional
-        r"FM-\d{2}\s+(T|[\d\.]+|)\s+.*"  # 7:Precip Total (in)
-    )
 
-    for line in lines:
-        match = line_pattern.match(line)
-        if not match:
-            continue
+class PrecipitationAggregator:
+    """
+    Incremental precipitation statistics for data that arrives in batches.
+
+    Per-day totals, the overall total and the set of significant days are
+    kept up to date as records are added, so folding in a new batch costs
+    O(batch) instead of recomputing the whole history.
+    """
 
-        try:
-            month_str, day_str, time_str, temp_str, wind_speed_str, wind_gust_str, precip_str = match.groups()
+    def __init__(self, threshold=0.1, key_prefix=''):
+        """
+        Args:
+            threshold (float): The daily total above which a day is significant.
+            key_prefix (str): Prepended to the 'MM-DD' day keys, e.g. '2024-'
+                for a file holding one year, so that the same calendar day of
+                different years stays separate when aggregators are merged.
+        """
+        self.threshold = threshold
+        self.key_prefix = key_prefix
+        self.count = 0
+        self.total_precip = 0
+        self.daily_precip = {}
+        self.significant_days = set()
+        # Position of each day in order of first appearance, for reporting
+        self.day_order = {}
 
-            # Clean and convert data types
-            month = int(month_str)
-            day = int(day_str)
-            temp = int(temp_str)
+    def add_to_day(self, date_key, amount):
+        """
+        Adds precipitation to one day's total and updates the significant days.
+        """
+        if date_key not in self.day_order:
+            self.day_order[date_key] = len(self.day_order)
+        total = self.daily_precip.get(date_key, 0.0) + amount
+        self.daily_precip[date_key] = total
 
-            # Precipitation: handle 'T' for trace and empty values
-            precip = 0.0 if precip_str.upper() == 'T' or not precip_str else float(precip_str)
+        if total > self.threshold:
+            self.significant_days.add(date_key)
+        else:
+            self.significant_days.discard(date_key)
 
-            # Wind Speed: handle non-numeric values like 'VRB'
-            wind_speed = 0 if not wind_speed_str.isdigit() else int(wind_speed_str)
+    def add(self, record):
+        """
+        Updates the statistics with one DataRecord.
+        """
+        self.count += 1
+        self.total_precip += record.Precip
+        self.add_to_day(f"{self.key_prefix}{record.Month:02d}-{record.Day:02d}", record.Precip)
 
-            # Wind Gust: handle missing values
-            wind_gust = 0 if not wind_gust_str or not wind_gust_str.isdigit() else int(wind_gust_str)
+    def add_batch(self, records):
+        """
+        Updates the statistics with a batch of DataRecords.
 
-            # Append cleaned record
-            cleaned_data.append(DataRecord(month, day, time_str, temp, precip, wind_speed, wind_gust))
+        Returns:
+            PrecipitationAggregator: This aggregator, to allow chaining.
+        """
+        for record in records:
+            self.add(record)
+        return self
+
+    def add_columns(self, columns):
+        """
+        Updates the statistics with a batch of LCDColumns.
+
+        Returns:
+            PrecipitationAggregator: This aggregator, to allow chaining.
+        """
+        self.count += len(columns.Precip)
+        self.total_precip += float(columns.Precip.sum())
+        for date_key, total in _daily_precip_totals(columns).items():
+            self.add_to_day(self.key_prefix + date_key, total)
+        return self
+
+    def merge(self, other):
+        """
+        Folds the statistics of another aggregator into this one.
+
+        Days with the same key are combined, so aggregators for different
+        years must have different key prefixes.
+
+        Returns:
+            PrecipitationAggregator: This aggregator, to allow chaining.
+        """
+        self.count += other.count
+        self.total_precip += other.total_precip
+        for date_key, total in other.daily_precip.items():
+            self.add_to_day(date_key, total)
+        return self
+
+    def results(self):
+        """
+        Returns the precipitation statistics in the analyze_precipitation format.
+
+        Only the significant days are visited, not the full history.
+        """
+        if not self.count:
+            return {}
+
+        # Days with significant precipitation, in order of first appearance
+        significant_days = {
+            day: round(self.daily_precip[day], 2)
+            for day in sorted(self.significant_days, key=self.day_order.__getitem__)
+        }
+
+        return {
+            'total_precip': round(self.total_precip, 2),
+            'significant_days': significant_days
+        }
 
-        except (ValueError, IndexError):
-            # Skip lines that do not conform to the expected format after matching
-            continue
 
-    return cleaned_data
+class ClimateAccumulator:
+    """
+    Streaming accumulator that computes every climate statistic in one pass.
+
+    Each record updates running totals, extremes and per-day precipitation
+    sums, so the temperature, precipitation and wind results can all be
+    produced from a single O(n) scan of the data.
+    """
+
+    def __init__(self, key_prefix=''):
+        """
+        Args:
+            key_prefix (str): The prefix of the precipitation day keys (see
+                PrecipitationAggregator).
+        """
+        self.count = 0
+        self.temp_total = 0
+        self.temp_max = None
+        self.temp_min = None
+        self.precipitation = PrecipitationAggregator(key_prefix=key_prefix)
+        self.speed_total = 0
+        self.max_sustained = None
+        self.max_gust = None
+
+    def add(self, record):
+        """
+        Updates the running statistics with one DataRecord.
+        """
+        self.count += 1
+
+        temp = record.Temp
+        self.temp_total += temp
+        if self.temp_max is None or temp > self.temp_max:
+            self.temp_max = temp
+        if self.temp_min is None or temp < self.temp_min:
+            self.temp_min = temp
+
+        self.precipitation.add(record)
+
+        self.speed_total += record.WindSpeed
+        if self.max_sustained is None or record.WindSpeed > self.max_sustained:
+            self.max_sustained = record.WindSpeed
+        if self.max_gust is None or record.WindGust > self.max_gust:
+            self.max_gust = record.WindGust
+
+    def add_many(self, records):
+        """
+        Updates the running statistics with every record in an iterable.
+
+        Returns:
+            ClimateAccumulator: This accumulator, to allow chaining.
+        """
+        for record in records:
+            self.add(record)
+        return self
+
+    def add_columns(self, columns):
+        """
+        Updates the running statistics with LCDColumns using vectorized
+        reductions.
+
+        Returns:
+            ClimateAccumulator: This accumulator, to allow chaining.
+        """
+        if not len(columns.Temp):
+            return self
+
+        other = ClimateAccumulator(self.precipitation.key_prefix)
+        other.count = len(columns.Temp)
+        other.temp_total = int(columns.Temp.sum(dtype=np.int64))
+        other.temp_max = int(columns.Temp.max())
+        other.temp_min = int(columns.Temp.min())
+        other.precipitation.add_columns(columns)
+        other.speed_total = int(columns.WindSpeed.sum(dtype=np.int64))
+        other.max_sustained = int(columns.WindSpeed.max())
+        other.max_gust = int(columns.WindGust.max())
+        return self.merge(other)
+
+    def merge(self, other):
+        """
+        Folds the partial statistics of another accumulator into this one.
+
+        This lets separately processed files (e.g. one per year) for the same
+        station be combined without re-reading any records. Precipitation days
+        are combined by key, so accumulators for different years must have
+        different key prefixes (as summarize_lcd_file gives them).
+
+        Returns:
+            ClimateAccumulator: This accumulator, to allow chaining.
+        """
+        if not other.count:
+            return self
+
+        self.count += other.count
+        self.temp_total += other.temp_total
+        self.temp_max = other.temp_max if self.temp_max is None else max(self.temp_max, other.temp_max)
+        self.temp_min = other.temp_min if self.temp_min is None else min(self.temp_min, other.temp_min)
+
+        self.precipitation.merge(other.precipitation)
+
+        self.speed_total += other.speed_total
+        self.max_sustained = (other.max_sustained if self.max_sustained is None
+                              else max(self.max_sustained, other.max_sustained))
+        self.max_gust = other.max_gust if self.max_gust is None else max(self.max_gust, other.max_gust)
+        return self
+
+    def temperature_results(self):
+        """
+        Returns the temperature statistics in the analyze_temperature format.
+        """
+        if not self.count:
+            return {}
+
+        return {
+            'overall_avg': round(self.temp_total / self.count, 1),
+            'overall_max': self.temp_max,
+            'overall_min': self.temp_min,
+        }
+
+    def precipitation_results(self):
+        """
+        Returns the precipitation statistics in the analyze_precipitation format.
+        """
+        return self.precipitation.results()
+
+    def wind_results(self):
+        """
+        Returns the wind statistics in the analyze_wind format.
+        """
+        if not self.count:
+            return {}
+
+        return {
+            'avg_speed': round(self.speed_total / self.count, 1),
+            'max_sustained': self.max_sustained,
+            'max_gust': self.max_gust
+        }
+
+
+def analyze_all(data):
+    """
+    Calculates the temperature, precipitation and wind statistics together.
+
+    Record iterables are scanned exactly once, so a streaming iterator from
+    stream_lcd_file can be analyzed without being held in memory.
+
+    Args:
+        data (iterable): An iterable of data record NamedTuples, or LCDColumns.
+
+    Returns:
+        tuple: The temperature, precipitation and wind result dictionaries, in
+        the same format as analyze_temperature, analyze_precipitation and
+        analyze_wind.
+    """
+    if isinstance(data, LCDColumns):
+        return (
+            _analyze_temperature_columns(data),
+            _analyze_precipitation_columns(data),
+            _analyze_wind_columns(data),
+        )
+
+    accumulator = ClimateAccumulator().add_many(data)
+    return (
+        accumulator.temperature_results(),
+        accumulator.precipitation_results(),
+        accumulator.wind_results(),
+    )
 
 
 def analyze_temperature(data):
     """
     Calculates overall average, max, and min temperatures from the dataset.
 
+    The data is consumed in a single pass, so a streaming iterator of records
+    can be passed in directly.
+
     Args:
-        data (list): A list of data record NamedTuples.
+        data (iterable): An iterable of data record NamedTuples, or LCDColumns.
 
     Returns:
         dict: A dictionary containing temperature statistics.
     """
-    if not data:
-        return {}
+    if isinstance(data, LCDColumns):
+        return _analyze_temperature_columns(data)
 
-    temps = [record.Temp for record in data]
+    count = 0
+    temp_total = 0
+    temp_max = None
+    temp_min = None
+
+    for record in data:
+        temp = record.Temp
+        count += 1
+        temp_total += temp
+        if temp_max is None or temp > temp_max:
+            temp_max = temp
+        if temp_min is None or temp < temp_min:
+            temp_min = temp
+
+    if not count:
+        return {}
 
     return {
-        'overall_avg': round(sum(temps) / len(temps), 1),
-        'overall_max': max(temps),
-        'overall_min': min(temps),
+        'overall_avg': round(temp_total / count, 1),
+        'overall_max': temp_max,
+        'overall_min': temp_min,
     }
 
 
@@ -99,63 +883,302 @@ def analyze_precipitation(data):
     """
     Calculates total precipitation and identifies significant rainfall days.
 
+    The data is consumed in a single pass, so a streaming iterator of records
+    can be passed in directly.
+
     Args:
-        data (list): A list of data record NamedTuples.
+        data (iterable): An iterable of data record NamedTuples, or LCDColumns.
 
     Returns:
         dict: A dictionary containing precipitation statistics.
     """
-    if not data:
+    if isinstance(data, LCDColumns):
+        return _analyze_precipitation_columns(data)
+
+    return PrecipitationAggregator().add_batch(data).results()
+
+
+def analyze_wind(data):
+    """
+    Calculates average wind speed, max sustained wind, and max wind gust.
+
+    The data is consumed in a single pass, so a streaming iterator of records
+    can be passed in directly.
+
+    Args:
+        data (iterable): An iterable of data record NamedTuples, or LCDColumns.
+
+    Returns:
+        dict: A dictionary containing wind statistics.
+    """
+    if isinstance(data, LCDColumns):
+        return _analyze_wind_columns(data)
+
+    count = 0
+    speed_total = 0
+    max_sustained = None
+    max_gust = None
+
+    for record in data:
+        count += 1
+        speed_total += record.WindSpeed
+        if max_sustained is None or record.WindSpeed > max_sustained:
+            max_sustained = record.WindSpeed
+        if max_gust is None or record.WindGust > max_gust:
+            max_gust = record.WindGust
+
+    if not count:
+        return {}
+
+    return {
+        'avg_speed': round(speed_total / count, 1),
+        'max_sustained': max_sustained,
+        'max_gust': max_gust
+    }
+
+
+def iter_column_records(columns):
+    """
+    Yields the rows of LCDColumns as DataRecords (with Time as an HHMM integer).
+    """
+    for row in zip(*(column.tolist() for column in columns)):
+        yield DataRecord(*row)
+
+
+def analyze_rolling(data, windows=None, year=None):
+    """
+    Calculates rolling 24h/7d/30d precipitation and temperature statistics.
+
+    This complements the whole-period analyze_precipitation and
+    analyze_temperature results; see rolling_stats.analyze_rolling_windows.
+
+    Args:
+        data (iterable): Data record NamedTuples in chronological order, or LCDColumns.
+        windows (dict): A dictionary mapping window labels to timedelta spans
+            (defaults to 24 hours, 7 days and 30 days).
+        year (int): The year of the first record, or None to infer it from
+            where leap days fall in the data (see rolling_stats.infer_start_year).
+
+    Returns:
+        dict: A dictionary mapping each window label to its statistics.
+    """
+    if isinstance(data, LCDColumns):
+        if year is None:
+            year = infer_start_year(data.Month.tolist(), data.Day.tolist())
+        data = iter_column_records(data)
+    return analyze_rolling_windows(data, windows, year)
+
+
+def _analyze_temperature_columns(columns):
+    """
+    Vectorized version of analyze_temperature for LCDColumns.
+    """
+    temps = columns.Temp
+    if not len(temps):
+        return {}
+
+    return {
+        'overall_avg': round(int(temps.sum(dtype=np.int64)) / len(temps), 1),
+        'overall_max': int(temps.max()),
+        'overall_min': int(temps.min()),
+    }
+
+
+def _daily_precip_totals(columns):
+    """
+    Totals the precipitation of LCDColumns per day.
+
+    Returns:
+        dict: A dictionary mapping 'MM-DD' date keys, in order of first
+        appearance like the record-based version, to the day's total.
+    """
+    if not len(columns.Precip):
         return {}
 
-    total_precip = sum(record.Precip for record in data)
+    # Encode each date as MMDD and total the precipitation per unique date
+    day_keys = columns.Month.astype(np.int32) * 100 + columns.Day
+    unique_keys, first_index, inverse = np.unique(day_keys, return_index=True, return_inverse=True)
+    daily_totals = np.bincount(inverse, weights=columns.Precip, minlength=len(unique_keys))
 
-    # Group precipitation by day
     daily_precip = {}
-    for record in data:
-        date_key = f"{record.Month:02d}-{record.Day:02d}"
-        daily_precip.setdefault(date_key, 0.0)
-        daily_precip[date_key] += record.Precip
+    for position in np.argsort(first_index, kind='stable'):
+        key = int(unique_keys[position])
+        daily_precip[f"{key // 100:02d}-{key % 100:02d}"] = float(daily_totals[position])
+    return daily_precip
+
+
+def _analyze_precipitation_columns(columns):
+    """
+    Vectorized version of analyze_precipitation for LCDColumns.
+    """
+    precip = columns.Precip
+    if not len(precip):
+        return {}
 
-    # Find days with significant precipitation (>0.1 inches)
     significant_days = {
         day: round(total, 2)
-        for day, total in daily_precip.items()
+        for day, total in _daily_precip_totals(columns).items()
         if total > 0.1
     }
 
     return {
-        'total_precip': round(total_precip, 2),
+        'total_precip': round(float(precip.sum()), 2),
         'significant_days': significant_days
     }
 
 
-def analyze_wind(data):
+def _analyze_wind_columns(columns):
     """
-    Calculates average wind speed, max sustained wind, and max wind gust.
+    Vectorized version of analyze_wind for LCDColumns.
+    """
+    wind_speeds = columns.WindSpeed
+    if not len(wind_speeds):
+        return {}
+
+    return {
+        'avg_speed': round(int(wind_speeds.sum(dtype=np.int64)) / len(wind_speeds), 1),
+        'max_sustained': int(wind_speeds.max()),
+        'max_gust': int(columns.WindGust.max())
+    }
+
+
+def station_name_from_path(path):
+    """
+    Derives the station name from an LCD file name.
+
+    Files are expected to be named '<station>.txt' or '<station>_<part>.txt'
+    (e.g. 'FLL_2024.txt'), so several files for one station are grouped.
 
     Args:
-        data (list): A list of data record NamedTuples.
+        path (str or Path): The path to an LCD text file.
 
     Returns:
-        dict: A dictionary containing wind statistics.
+        str: The station name.
     """
-    if not data:
-        return {}
+    return Path(path).stem.split('_')[0]
 
-    wind_speeds = [record.WindSpeed for record in data]
-    wind_gusts = [record.WindGust for record in data]
 
-    return {
-        'avg_speed': round(sum(wind_speeds) / len(wind_speeds), 1),
-        'max_sustained': max(wind_speeds),
-        'max_gust': max(wind_gusts)
-    }
+def file_part_from_path(path):
+    """
+    Returns the '<part>' of a '<station>_<part>.txt' file name (e.g. '2024'), or '' if there is none.
+    """
+    _, _, part = Path(path).stem.partition('_')
+    return part
+
+
+def year_from_path(path):
+    """
+    Returns the year of a '<station>_<year>.txt' file name (e.g. 'FLL_2024.txt'), or None if it has none.
+    """
+    part = file_part_from_path(path)
+    return int(part) if len(part) == 4 and part.isdigit() else None
+
+
+def summarize_lcd_file(path, cache_dir=None):
+    """
+    Parses one LCD file and reduces it to partial climate statistics.
+
+    This is the worker run by run_station_pipeline in each process. Only the
+    small accumulator is sent back to the parent, never the parsed records.
+
+    Args:
+        path (str or Path): The path to an LCD text file.
+        cache_dir (str or Path): If given, load the file through the parsed
+            data cache in this directory (see load_lcd_file_cached).
+
+    Returns:
+        tuple: The station name and the ClimateAccumulator for the file, whose
+        precipitation days are keyed '<part>-MM-DD' when the file name has a
+        part (e.g. '2024-02-24' for 'FLL_2024.txt').
+    """
+    part = file_part_from_path(path)
+    accumulator = ClimateAccumulator(f"{part}-" if part else '')
+    if cache_dir is not None:
+        accumulator.add_columns(load_lcd_file_cached(path, cache_dir))
+    else:
+        accumulator.add_many(stream_lcd_mmap(path))
+    return station_name_from_path(path), accumulator
+
+
+def run_station_pipeline(directory, pattern='*.txt', max_workers=None, cache_dir=None):
+    """
+    Parses every LCD file in a directory in parallel and merges the results
+    per station.
+
+    Files are handed out to a process pool, so wall-clock time scales with
+    the number of cores. The per-file partial statistics are then merged
+    into one ClimateAccumulator per station.
+
+    Args:
+        directory (str or Path): The directory containing the LCD text files.
+        pattern (str): The glob pattern used to select LCD files.
+        max_workers (int): The number of worker processes (defaults to the
+            number of CPUs).
+        cache_dir (str or Path): If given, cache the parsed data of each file
+            in this directory so unchanged files are not parsed again.
+
+    Returns:
+        dict: A dictionary mapping station names, in sorted order, to their
+        merged ClimateAccumulator.
+    """
+    lcd_paths = sorted(Path(directory).glob(pattern))
+
+    stations = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summarize = partial(summarize_lcd_file, cache_dir=cache_dir)
+        for station, accumulator in executor.map(summarize, lcd_paths):
+            stations.setdefault(station, ClimateAccumulator()).merge(accumulator)
+
+    return dict(sorted(stations.items()))
+
+
+def print_report(station_name, temp_results, precip_results, wind_results, rolling_results=None):
+    """
+    Prints the climatological analysis report for one station.
+
+    Args:
+        station_name (str): The station name used in the report title.
+        temp_results (dict): The analyze_temperature results.
+        precip_results (dict): The analyze_precipitation results.
+        wind_results (dict): The analyze_wind results.
+        rolling_results (dict): The analyze_rolling results, if available.
+    """
+    print(f"### Climatological Analysis Report: {station_name} ###")
+
+    print("\n--- 4.1 Temperature Analysis ---")
+    print(f"Overall Average Temperature: {temp_results.get('overall_avg', 'N/A')}°F")
+    print(f"Highest Recorded Temperature: {temp_results.get('overall_max', 'N/A')}°F")
+    print(f"Lowest Recorded Temperature: {temp_results.get('overall_min', 'N/A')}°F")
+
+    print("\n--- 4.2 Precipitation Analysis ---")
+    print(f"Total Recorded Precipitation: {precip_results.get('total_precip', 'N/A')} inches")
+    print("Significant Precipitation Events (>0.1 inches):")
+    for day, total in precip_results.get('significant_days', {}).items():
+        print(f"  - Date {day}: {total} inches")
+
+    print("\n--- 4.3 Wind Speed Analysis ---")
+    print(f"Average Sustained Wind Speed: {wind_results.get('avg_speed', 'N/A')} MPH")
+    print(f"Maximum Sustained Wind Speed: {wind_results.get('max_sustained', 'N/A')} MPH")
+    print(f"Maximum Wind Gust: {wind_results.get('max_gust', 'N/A')} MPH")
+
+    if rolling_results:
+        print("\n--- 4.4 Rolling Window Analysis ---")
+        for label, stats in rolling_results.items():
+            print(f"{label} Window:")
+            print(f"  - Maximum Precipitation: {stats['max_precip']} inches (ending {stats['max_precip_end']})")
+            print(f"  - Highest Rolling Average Temperature: {stats['max_avg_temp']}°F")
+            print(f"  - Lowest Rolling Average Temperature: {stats['min_avg_temp']}°F")
 
 
 def main():
     """
     Main execution function to run the full analysis pipeline and print results.
+
+    If an LCD text file is given on the command line it is loaded (through the
+    parsed data cache) instead of using the embedded sample data, and the
+    report is titled with the station from its file name. If a
+    directory is given, every LCD file in it is processed by the multi-station
+    pipeline.
     """
     # All relevant hourly data from the source documents for Feb and Mar 2025
     # has been embedded here to make the script self-contained and reproducible.
@@ -180,31 +1203,40 @@ def main():
     08 20 1353 7 FEW:02 55 10.00 98 36.7 78 25.6 70 21.1 40 13 VRB 18 29.80 29.83 FM-15 0.00 29.82
     """
 
-    data = load_and_clean_data(source_data_content)
-
     # --- Analysis ---
-    temp_results = analyze_temperature(data)
-    precip_results = analyze_precipitation(data)
-    wind_results = analyze_wind(data)
+    if len(sys.argv) > 1 and Path(sys.argv[1]).is_dir():
+        # A directory of LCD files: parse the stations in parallel and print
+        # one report per station
+        stations = run_station_pipeline(sys.argv[1], cache_dir=Path(sys.argv[1]) / '.lcd_cache')
+        for index, (station, accumulator) in enumerate(stations.items()):
+            if index:
+                print()
+            print_report(
+                station,
+                accumulator.temperature_results(),
+                accumulator.precipitation_results(),
+                accumulator.wind_results(),
+            )
+        return
 
-    # --- Reporting ---
-    print("### Climatological Analysis Report: Fort Lauderdale International Airport ###")
-
-    print("\n--- 4.1 Temperature Analysis ---")
-    print(f"Overall Average Temperature: {temp_results.get('overall_avg', 'N/A')}°F")
-    print(f"Highest Recorded Temperature: {temp_results.get('overall_max', 'N/A')}°F")
-    print(f"Lowest Recorded Temperature: {temp_results.get('overall_min', 'N/A')}°F")
+    if len(sys.argv) > 1:
+        # Load the file through the parsed data cache, so only the first run
+        # over an unchanged archive has to parse it. LCD lines carry no year,
+        # so it comes from the file name when it has one ('FLL_2024.txt') and
+        # is otherwise inferred from the data
+        data = load_lcd_file_cached(sys.argv[1])
+        year = year_from_path(sys.argv[1])
+        station_name = station_name_from_path(sys.argv[1])
+    else:
+        data = load_and_clean_data(source_data_content)
+        year = 2025
+        station_name = "Fort Lauderdale International Airport"
 
-    print("\n--- 4.2 Precipitation Analysis ---")
-    print(f"Total Recorded Precipitation: {precip_results.get('total_precip', 'N/A')} inches")
-    print("Significant Precipitation Events (>0.1 inches):")
-    for day, total in precip_results.get('significant_days', {}).items():
-        print(f"  - Date {day}: {total} inches")
+    temp_results, precip_results, wind_results = analyze_all(data)
+    rolling_results = analyze_rolling(data, year=year)
 
-    print("\n--- 4.3 Wind Speed Analysis ---")
-    print(f"Average Sustained Wind Speed: {wind_results.get('avg_speed', 'N/A')} MPH")
-    print(f"Maximum Sustained Wind Speed: {wind_results.get('max_sustained', 'N/A')} MPH")
-    print(f"Maximum Wind Gust: {wind_results.get('max_gust', 'N/A')} MPH")
+    # --- Reporting ---
+    print_report(station_name, temp_results, precip_results, wind_results, rolling_results)
 
 
 if __name__ == "__main__":
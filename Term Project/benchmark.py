@@ -0,0 +1,233 @@
+import argparse
+import io
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak memory falls back to tracemalloc there
+    resource = None
+
+from TermProject import (analyze_all, analyze_rolling, iter_clean_records, load_and_clean_data,
+                         parse_line, parse_line_regex, print_report, records_to_columns,
+                         stream_lcd_file, stream_lcd_mmap)
+
+
+# Line counts benchmarked by default
+DEFAULT_SIZES = [10 ** 4, 10 ** 6, 10 ** 7]
+
+
+def generate_lcd_lines(line_count, seed=0, start=datetime(2025, 1, 1)):
+    """
+    Generates synthetic LCD lines in the same layout as the embedded sample data.
+
+    Lines move forward in time like a real station archive: mostly hourly
+    FM-15 reports at :53 with FM-16 specials in between, a mix of numeric and
+    VRB winds, occasional gusts, and trace ('T') precipitation.
+
+    Args:
+        line_count (int): The number of lines to generate.
+        seed (int): The random seed, so runs are reproducible.
+        start (datetime): The time of the first report.
+
+    Yields:
+        str: One raw LCD line at a time.
+    """
+    rng = random.Random(seed)
+    timestamp = start.replace(minute=53)
+    report_time = timestamp
+
+    for _ in range(line_count):
+        if rng.random() < 0.25:
+            # Special (FM-16) report after the last one, before the next hourly one
+            report_time = min(report_time + timedelta(minutes=rng.randint(1, 15)),
+                              timestamp + timedelta(minutes=59))
+            report_type = 'FM-16'
+        else:
+            timestamp += timedelta(hours=1)
+            report_time = timestamp
+            report_type = 'FM-15'
+
+        temp_f = rng.randint(35, 99)
+        temp_c = round((temp_f - 32) / 1.8, 1)
+        dew_f = temp_f - rng.randint(0, 20)
+        dew_c = round((dew_f - 32) / 1.8, 1)
+
+        sky = rng.choice(['FEW:02 31', 'OVC:08 50', 'SCT:04 27 BKN:07 34 OVC:08 60', 'BKN:07 16'])
+        weather = rng.choice(['', '', '', 'RA:02 BR:1 |RA |RA ', '-RA:02 |RA |RA ', 'TS:7 |TS TS | '])
+
+        wind_speed = rng.choice([str(rng.randint(0, 30)), 'VRB'])
+        direction = rng.choice([f"{rng.randrange(0, 360, 10):03d}", 'VRB'])
+        gust = f"{rng.randint(15, 45)} " if rng.random() < 0.3 else ''
+
+        precip = rng.choice(['0.00', '0.00', '0.00', 'T', f"{rng.random() * 0.5:.2f}"])
+        pressure = f"{rng.uniform(29.7, 30.3):.2f}"
+
+        yield (f"{report_time:%m %d %H%M} 7 {sky} 10.00 {weather}"
+               f"{temp_f} {temp_c} {dew_f} {dew_c} {rng.randint(40, 100)} "
+               f"{wind_speed} {direction} {gust}{pressure} {pressure} {report_type} {precip} {pressure}")
+
+
+def write_lcd_file(path, line_count, seed=0):
+    """
+    Writes a synthetic LCD text file to disk.
+    """
+    with open(path, 'w', encoding='utf-8') as lcd_file:
+        for line in generate_lcd_lines(line_count, seed):
+            lcd_file.write(line + '\n')
+
+
+def verify_parsers(path):
+    """
+    Checks that parse_line and parse_line_regex produce identical records.
+    """
+    with open(path, encoding='utf-8') as lcd_file:
+        regex_records = list(iter_clean_records(lcd_file, parser=parse_line_regex))
+    with open(path, encoding='utf-8') as lcd_file:
+        tokenizer_records = list(iter_clean_records(lcd_file, parser=parse_line))
+
+    if regex_records != tokenizer_records:
+        raise AssertionError("The tokenizer and regex parsers produced different records")
+
+
+def _parse_regex(path):
+    with open(path, encoding='utf-8') as lcd_file:
+        return sum(1 for _ in iter_clean_records(lcd_file, parser=parse_line_regex))
+
+
+def _parse_tokenizer(path):
+    return sum(1 for _ in stream_lcd_file(path))
+
+
+def _parse_mmap(path):
+    return sum(1 for _ in stream_lcd_mmap(path))
+
+
+def _load_in_memory(path):
+    return len(load_and_clean_data(Path(path).read_text(encoding='utf-8')))
+
+
+def _analyze_streaming(path):
+    return analyze_all(stream_lcd_mmap(path))
+
+
+def _analyze_columns(path):
+    return analyze_all(records_to_columns(stream_lcd_mmap(path)))
+
+
+def _full_report(path):
+    data = records_to_columns(stream_lcd_mmap(path))
+    temp_results, precip_results, wind_results = analyze_all(data)
+    rolling_results = analyze_rolling(data)
+    with redirect_stdout(io.StringIO()):
+        print_report("Synthetic Station", temp_results, precip_results, wind_results, rolling_results)
+
+
+# Benchmarked stages: each one takes the path of an LCD file
+STAGES = {
+    'parse (regex)': _parse_regex,
+    'parse (tokenizer)': _parse_tokenizer,
+    'parse (mmap)': _parse_mmap,
+    'load (in-memory string)': _load_in_memory,
+    'analyze (streaming)': _analyze_streaming,
+    'analyze (columns)': _analyze_columns,
+    'report (end to end)': _full_report,
+}
+
+
+def measure_stage(stage, path):
+    """
+    Runs one stage and measures its duration and peak memory.
+
+    This is meant to run in a fresh process, so the peak resident set size
+    belongs to this stage alone.
+
+    Returns:
+        tuple: The elapsed seconds and the peak memory in bytes.
+    """
+    if resource is None:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    STAGES[stage](path)
+    elapsed = time.perf_counter() - start
+
+    if resource is None:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS but in kilobytes on Linux
+    return elapsed, peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_benchmarks(sizes=None, stages=None, work_dir=None):
+    """
+    Runs every stage at every size and prints throughput and peak memory.
+
+    Each stage runs in its own process so peak memory measurements don't
+    carry over between stages.
+
+    Args:
+        sizes (list): The line counts to benchmark (defaults to DEFAULT_SIZES).
+        stages (list): The stage names to run (defaults to all of STAGES).
+        work_dir (str or Path): Where to write the synthetic files (defaults
+            to a temporary directory).
+
+    Returns:
+        list: One (size, stage, seconds, lines per second, peak bytes) tuple
+        per measurement.
+    """
+    sizes = DEFAULT_SIZES if sizes is None else sizes
+    stages = list(STAGES) if stages is None else stages
+    spawn_context = get_context('spawn')
+    results = []
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as temp_dir:
+        print(f"{'Lines':>12} {'Stage':<24} {'Seconds':>9} {'Lines/s':>12} {'Peak MB':>9}")
+        for size in sizes:
+            lcd_path = Path(temp_dir) / f"synthetic_{size}.txt"
+            write_lcd_file(lcd_path, size)
+            if size == min(sizes):
+                verify_parsers(lcd_path)
+
+            for stage in stages:
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn_context) as executor:
+                    elapsed, peak = executor.submit(measure_stage, stage, str(lcd_path)).result()
+
+                throughput = size / elapsed
+                print(f"{size:>12,} {stage:<24} {elapsed:>9.2f} {throughput:>12,.0f} {peak / 2 ** 20:>9.1f}")
+                results.append((size, stage, elapsed, throughput, peak))
+
+            lcd_path.unlink()
+
+    return results
+
+
+def main():
+    """
+    Benchmarks parsing, analysis and reporting on synthetic LCD files.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__.strip())
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES,
+                        help="line counts to benchmark (default: 10^4, 10^6 and 10^7)")
+    parser.add_argument('--stage', action='append', choices=list(STAGES), dest='stages',
+                        help="only run this stage (may be repeated)")
+    parser.add_argument('--work-dir', help="directory for the synthetic files")
+    args = parser.parse_args()
+
+    run_benchmarks(args.sizes, args.stages, args.work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import calendar
+import warnings
+from collections import deque
+from datetime import date, datetime, timedelta
+
+
+# Window lengths reported alongside the whole-period statistics
+ROLLING_WINDOWS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+}
+
+
+class RollingWindow:
+    """
+    Time-based sliding window with O(1) amortized updates.
+
+    Values are kept in a deque in arrival order together with a running sum.
+    Each value enters and leaves the deque once, so a full pass over n records
+    costs O(n) instead of the O(n * window) of recomputing each window.
+    """
+
+    def __init__(self, span):
+        self.span = span
+        self.values = deque()
+        self.total = 0.0
+
+    def add(self, timestamp, value):
+        """
+        Adds a value and drops every value older than the window span.
+
+        Args:
+            timestamp (datetime): The time of the value; must not be earlier
+                than the previously added timestamp.
+            value (float): The value to add.
+        """
+        self.values.append((timestamp, value))
+        self.total += value
+
+        # The window covers (timestamp - span, timestamp]
+        window_start = timestamp - self.span
+        while self.values[0][0] <= window_start:
+            _, old_value = self.values.popleft()
+            self.total -= old_value
+
+    def count(self):
+        """
+        Returns the number of values in the window.
+        """
+        return len(self.values)
+
+    def mean(self):
+        """
+        Returns the mean of the values in the window, or None if it is empty.
+        """
+        return self.total / len(self.values) if self.values else None
+
+
+def infer_start_year(months, days, latest_year=None):
+    """
+    Infers the year of the first record from where leap days fall.
+
+    Records are assumed to be in chronological order, so a month earlier than
+    the previous record's month starts the next year. The result is the
+    latest year (with the last record no later than latest_year) that makes
+    every February 29th in the data a real date.
+
+    Args:
+        months (iterable): The month of each record.
+        days (iterable): The day of each record.
+        latest_year (int): The latest possible year of the last record
+            (defaults to the current year).
+
+    Returns:
+        int: The year of the first record.
+    """
+    latest_year = date.today().year if latest_year is None else latest_year
+
+    year_offset = 0
+    leap_offsets = set()
+    previous_month = None
+    for month, day in zip(months, days):
+        if previous_month is not None and month < previous_month:
+            year_offset += 1
+        previous_month = month
+        if month == 2 and day == 29:
+            leap_offsets.add(year_offset)
+
+    start_year = latest_year - year_offset
+    while not all(calendar.isleap(start_year + offset) for offset in leap_offsets):
+        start_year -= 1
+    return start_year
+
+
+def iter_timestamps(records, year):
+    """
+    Attaches a timestamp to each record.
+
+    LCD records carry no year, so records are assumed to be in chronological
+    order starting in the given year; a month earlier than the previous
+    record's month starts the next year. A time of 2400 is midnight at the
+    end of the day. Records with an impossible date or time (such as 04-31
+    or 1275) are skipped with a warning, as they cannot be placed in a window.
+
+    Args:
+        records (iterable): An iterable of data record NamedTuples.
+        year (int): The year of the first record (see infer_start_year).
+
+    Yields:
+        tuple: The record's datetime and the record.
+
+    Raises:
+        ValueError: If a record falls on February 29th of a non-leap year,
+            i.e. the year is wrong for the data.
+    """
+    previous_month = None
+    skipped = 0
+    for record in records:
+        if previous_month is not None and record.Month < previous_month:
+            year += 1
+        previous_month = record.Month
+
+        if record.Month == 2 and record.Day == 29 and not calendar.isleap(year):
+            raise ValueError(f"Record on 02-29 falls in {year}, which is not a leap year; "
+                             f"pass the correct year or let it be inferred")
+
+        hour, minute = divmod(int(record.Time), 100)
+        if minute > 59 or hour * 60 + minute > 24 * 60:
+            skipped += 1
+            continue
+        try:
+            day = datetime(year, record.Month, record.Day)
+        except ValueError:
+            skipped += 1
+            continue
+        yield day + timedelta(hours=hour, minutes=minute), record
+
+    if skipped:
+        warnings.warn(f"Skipped {skipped} records with an impossible date or time in the rolling statistics")
+
+
+def analyze_rolling_windows(data, windows=None, year=None):
+    """
+    Calculates rolling-window precipitation and temperature statistics.
+
+    For each window length this finds the largest precipitation total within
+    any window (e.g. the wettest 24 hours) and the highest and lowest rolling
+    mean temperature, in one pass over the records.
+
+    Args:
+        data (iterable): An iterable of data record NamedTuples in
+            chronological order.
+        windows (dict): A dictionary mapping window labels to timedelta spans
+            (defaults to ROLLING_WINDOWS).
+        year (int): The year of the first record, or None to infer it from
+            the data (see infer_start_year), which needs the records in memory.
+
+    Returns:
+        dict: A dictionary mapping each window label to its statistics, or an
+        empty dictionary if there is no data.
+    """
+    windows = ROLLING_WINDOWS if windows is None else windows
+    if year is None:
+        data = list(data)
+        year = infer_start_year([record.Month for record in data], [record.Day for record in data])
+
+    precip_windows = {label: RollingWindow(span) for label, span in windows.items()}
+    temp_windows = {label: RollingWindow(span) for label, span in windows.items()}
+    results = {
+        label: {'max_precip': None, 'max_precip_end': None, 'max_avg_temp': None, 'min_avg_temp': None}
+        for label in windows
+    }
+
+    for timestamp, record in iter_timestamps(data, year):
+        for label in windows:
+            stats = results[label]
+
+            precip_window = precip_windows[label]
+            precip_window.add(timestamp, record.Precip)
+            if stats['max_precip'] is None or precip_window.total > stats['max_precip']:
+                stats['max_precip'] = precip_window.total
+                stats['max_precip_end'] = timestamp.strftime('%m-%d %H%M')
+
+            temp_window = temp_windows[label]
+            temp_window.add(timestamp, record.Temp)
+            avg_temp = temp_window.mean()
+            if stats['max_avg_temp'] is None or avg_temp > stats['max_avg_temp']:
+                stats['max_avg_temp'] = avg_temp
+            if stats['min_avg_temp'] is None or avg_temp < stats['min_avg_temp']:
+                stats['min_avg_temp'] = avg_temp
+
+    if all(stats['max_precip'] is None for stats in results.values()):
+        return {}
+
+    for stats in results.values():
+        stats['max_precip'] = round(stats['max_precip'], 2)
+        stats['max_avg_temp'] = round(stats['max_avg_temp'], 1)
+        stats['min_avg_temp'] = round(stats['min_avg_temp'], 1)
+
+    return results
@@ -0,0 +1,227 @@
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+from refinery_lookups import NO_DATA, DriveTimeClient, FloodZoneClient, ResponseCache
+
+# Zone subtypes the stand-in FEMA server answers with (None is a flood zone without a subtype)
+STAND_IN_ZONES = [None, 'FLOODWAY', 'AREA OF MINIMAL FLOOD HAZARD', '0.2 PCT ANNUAL CHANCE FLOOD HAZARD']
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers like the FEMA NFHL query endpoint and the OSRM route service.
+
+    Every request waits the server's latency, and a share of them (the
+    server's failure_rate) fail so retries are exercised: with a 503, or for
+    FEMA queries half of the time with a 200 and an ArcGIS error body, like
+    the real MapServer. Answers only depend on the coordinates, so every run
+    gets the same results:
+        .../MapServer/28/query: no features, or one zone from STAND_IN_ZONES.
+        /route/v1/driving/<lon>,<lat>;<lon>,<lat>: a duration, or a 400
+            NoRoute (like OSRM) when the origin longitude is positive.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        with server.lock:
+            server.request_count += 1
+            fail = server.rng.random() < server.failure_rate
+            arcgis_error = server.rng.random() < 0.5
+            server.failure_count += fail
+
+        url = urllib.parse.urlsplit(self.path)
+        if fail:
+            if arcgis_error and url.path.endswith('/MapServer/28/query'):
+                return self._send(200, {'error': {'code': 500, 'message': 'Error performing query operation',
+                                                  'details': []}})
+            return self._send(503, {'error': {'code': 503, 'message': 'Service busy'}})
+
+        if url.path.endswith('/MapServer/28/query'):
+            geometry = urllib.parse.parse_qs(url.query)['geometry'][0]
+            lon, lat = map(float, geometry.split(','))
+            zone_index = int(abs(lon * 1000 + lat * 7)) % (len(STAND_IN_ZONES) + 1)
+            if zone_index == len(STAND_IN_ZONES):
+                return self._send(200, {'features': []})
+            return self._send(200, {'features': [{'attributes': {'ZONE_SUBTY': STAND_IN_ZONES[zone_index]}}]})
+
+        if url.path.startswith('/route/v1/driving/'):
+            origin, destination = url.path.rsplit('/', 1)[1].split(';')
+            origin_lon, origin_lat = map(float, origin.split(','))
+            dest_lon, dest_lat = map(float, destination.split(','))
+            if origin_lon > 0:
+                return self._send(400, {'code': 'NoRoute', 'message': 'Impossible route between points'})
+            duration = round(abs(origin_lon - dest_lon) * 3000 + abs(origin_lat - dest_lat) * 2000, 1)
+            return self._send(200, {'code': 'Ok', 'routes': [{'duration': duration}]})
+
+        self._send(404, {'error': 'not found'})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_stand_in_server(latency=0.05, failure_rate=0.0, seed=0):
+    """
+    Starts a StandInHandler server on a free local port in a background thread.
+
+    Args:
+        latency (float): The delay before each answer in seconds.
+        failure_rate (float): The share of requests that fail.
+        seed (int): The random seed for the failures.
+
+    Returns:
+        tuple: The server (call shutdown() when done) and its base URL.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.failure_rate = failure_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.failure_count = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def fema_url(base_url):
+    return f"{base_url}/arcgis/rest/services/public/NFHL/MapServer/28/query"
+
+
+def lookup_sequentially(url, points):
+    """
+    The original Week 7 loop: one requests.get per point, then a fixed 0.1 second sleep.
+    """
+    zones = []
+    for lon, lat in points:
+        query = {
+            'geometry': f'{lon},{lat}',
+            'geometryType': 'esriGeometryPoint',
+            'inSR': '4326',
+            'spatialRel': 'esriSpatialRelIntersects',
+            'outFields': 'ZONE_SUBTY',
+            'returnGeometry': 'false',
+            'f': 'pjson'
+        }
+        data = requests.get(url + '?' + urllib.parse.urlencode(query)).json()
+
+        if 'features' in data and len(data['features']) > 0 and data['features'][0]['attributes']['ZONE_SUBTY']:
+            zones.append(data['features'][0]['attributes']['ZONE_SUBTY'])
+        else:
+            zones.append(NO_DATA)
+
+        time.sleep(0.1)
+    return zones
+
+
+def synthetic_points(count, seed=0):
+    """
+    Returns (lon, lat) strings for refineries scattered over the continental US, like the CSV columns.
+    """
+    rng = random.Random(seed)
+    return [(f"{rng.uniform(-120, -70):.4f}", f"{rng.uniform(25, 48):.4f}") for _ in range(count)]
+
+
+def benchmark_flood_zones(point_count, latency, failure_rate, max_workers, requests_per_second, retries):
+    """
+    Compares the sequential loop against FloodZoneClient on stand-in servers.
+
+    The sequential loop runs against a server that never fails (it has no
+    retries), the client against one that fails failure_rate of the time;
+    both must produce the same zones.
+    """
+    points = synthetic_points(point_count)
+
+    server, base_url = start_stand_in_server(latency)
+    start = time.perf_counter()
+    sequential_zones = lookup_sequentially(fema_url(base_url), points)
+    sequential_time = time.perf_counter() - start
+    server.shutdown()
+
+    server, base_url = start_stand_in_server(latency, failure_rate)
+    with FloodZoneClient(fema_url(base_url), max_workers=max_workers, requests_per_second=requests_per_second,
+                         retries=retries, backoff=0.05) as client:
+        start = time.perf_counter()
+        client_zones = client.lookup_many(points)
+        client_time = time.perf_counter() - start
+    server.shutdown()
+
+    if client_zones != sequential_zones:
+        raise AssertionError("FloodZoneClient produced different zones than the sequential loop")
+
+    rate = 'unlimited' if requests_per_second is None else f"{requests_per_second:g}/s"
+    print(f"{'Points':>7} {'Lookup':<34} {'Seconds':>9}")
+    print(f"{point_count:>7,} {'sequential + 0.1 s sleeps':<34} {sequential_time:>9.2f}")
+    print(f"{point_count:>7,} {f'client ({max_workers} workers, {rate})':<34} {client_time:>9.2f}")
+    print(f"Speedup: {sequential_time / client_time:.1f}x; the client retried {server.failure_count} failed "
+          f"requests ({server.request_count} requests in total)")
+
+
+def verify_drive_times_and_cache(point_count=20):
+    """
+    Checks DriveTimeClient's NoRoute handling and that a cached re-run sends no requests.
+    """
+    origins = synthetic_points(point_count, seed=1)
+    # A point east of the prime meridian gets a 400 NoRoute from the stand-in server
+    origins[0] = ('10.5000', origins[0][1])
+    destinations = synthetic_points(point_count, seed=2)
+    pairs = list(zip(origins, destinations))
+
+    server, base_url = start_stand_in_server(latency=0.0)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ResponseCache(Path(temp_dir) / 'lookups.sqlite') as cache:
+            with DriveTimeClient(f"{base_url}/route/v1/driving", requests_per_second=None, cache=cache) as client:
+                durations = client.lookup_many(pairs)
+                first_run_requests = server.request_count
+                if client.lookup_many(pairs) != durations or server.request_count != first_run_requests:
+                    raise AssertionError("A cached re-run sent requests or returned different durations")
+    server.shutdown()
+
+    if durations[0] != NO_DATA or NO_DATA in durations[1:]:
+        raise AssertionError("DriveTimeClient mishandled a NoRoute answer")
+
+
+def main():
+    """
+    Benchmarks the Week 7 FEMA flood zone lookups against a local stand-in server.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__.strip())
+    parser.add_argument('points', nargs='?', type=int, default=120,
+                        help="number of refineries to look up (default: 120)")
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help="stand-in server delay per request in seconds (default: 0.05)")
+    parser.add_argument('--failure-rate', type=float, default=0.1,
+                        help="share of requests the stand-in server fails (default: 0.1)")
+    parser.add_argument('--workers', type=int, default=8, help="concurrent client requests (default: 8)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="client requests per second (default: unlimited)")
+    parser.add_argument('--retries', type=int, default=3,
+                        help="client retries per failed request; raise it with high failure rates (default: 3)")
+    args = parser.parse_args()
+
+    verify_drive_times_and_cache()
+    benchmark_flood_zones(args.points, args.latency, args.failure_rate, args.workers, args.rate,
+                          args.retries)
+
+
+if __name__ == "__main__":
+    main()
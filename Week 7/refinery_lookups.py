@@ -0,0 +1,417 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# FEMA National Flood Hazard Layer flood hazard zones
+FEMA_URL = 'https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer/28/query'
+
+# OSRM public demo server driving routes
+OSRM_URL = 'http://router.project-osrm.org/route/v1/driving'
+
+# Value recorded when a lookup finds nothing
+NO_DATA = 'No Data'
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Bump when the format of cached lookup results changes so old entries are ignored
+CACHE_VERSION = 1
+
+# How long cached lookups stay valid: 30 days
+DEFAULT_CACHE_TTL = 30 * 24 * 3600
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls evenly at a maximum rate.
+
+    Each call to wait() reserves the next free slot (1 / rate seconds after
+    the previous one) and sleeps until it, so concurrent workers together
+    never exceed the rate, without a fixed sleep after every request.
+    """
+
+    def __init__(self, rate: Optional[float]):
+        """
+        Args:
+            rate (float): The maximum number of calls per second, or None for
+                no limit.
+        """
+        self.interval = 1 / rate if rate else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Blocks until the caller may make its next call.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RetryableError(Exception):
+    """
+    A response that failed for a transient reason (see RETRY_STATUSES).
+    """
+
+
+class ResponseCache:
+    """
+    Persistent cache of lookup results in an SQLite file, with time-based expiry.
+
+    Results are stored as JSON by (namespace, key), with the time they were
+    fetched; an entry older than the TTL is treated as missing and replaced
+    the next time it is fetched. The cache may be shared by several clients
+    and threads.
+    """
+
+    def __init__(self, path, ttl: float = DEFAULT_CACHE_TTL):
+        """
+        Args:
+            path (str or Path): The SQLite database file (created if needed).
+            ttl (float): How long entries stay valid in seconds.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, fetched_at REAL NOT NULL, '
+                'PRIMARY KEY (namespace, key))'
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self._connection.close()
+
+    def get(self, namespace: str, key: str):
+        """
+        Returns a cached result, or None if there is none or it has expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM responses WHERE namespace = ? AND key = ? AND fetched_at > ?',
+                (namespace, key, time.time() - self.ttl)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, namespace: str, key: str, value) -> None:
+        """
+        Stores a result, replacing any older entry.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses (namespace, key, value, fetched_at) VALUES (?, ?, ?, ?)',
+                (namespace, key, json.dumps(value), time.time())
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Deletes expired entries and returns how many were deleted.
+        """
+        with self._lock, self._connection:
+            return self._connection.execute('DELETE FROM responses WHERE fetched_at <= ?',
+                                            (time.time() - self.ttl,)).rowcount
+
+
+class LookupClient(ABC):
+    """
+    Base class for looking up many points concurrently against a JSON web API.
+
+    Requests share one pooled requests.Session (so connections are reused
+    instead of opened per point), at most max_workers run at once, and a
+    RateLimiter spaces them out. Connection errors, timeouts and retryable
+    statuses are retried with exponential backoff. The URL can point at any
+    server that answers like the real API, such as a local stand-in for
+    testing.
+
+    With a ResponseCache, results are cached under the subclass's
+    cache_key, and only new or expired lookups are sent to the server.
+
+    Subclasses define CACHE_NAMESPACE, cache_key(*query) and fetch(*query).
+    """
+
+    CACHE_NAMESPACE = None
+
+    def __init__(self, url: str, max_workers: int = 8, requests_per_second: Optional[float] = 10,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 30, session: requests.Session = None,
+                 cache: ResponseCache = None, precision: int = 5):
+        """
+        Args:
+            url (str): The API URL.
+            max_workers (int): The maximum number of concurrent requests.
+            requests_per_second (float): The maximum request rate, or None for
+                no limit.
+            retries (int): How many times a failed request is retried.
+            backoff (float): The delay before the first retry in seconds,
+                doubled on every further retry.
+            timeout (float): The timeout of each request in seconds.
+            session (requests.Session): The session to use (defaults to a new
+                one with a connection pool of max_workers).
+            cache (ResponseCache): The cache for results, or None to disable
+                caching.
+            precision (int): The decimal places coordinates are rounded to in
+                cache keys (5 is about 1 m).
+        """
+        self.url = url
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = RateLimiter(requests_per_second)
+        self.cache = cache
+        self.precision = precision
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the session's pooled connections.
+        """
+        self.session.close()
+
+    def get_json(self, url: str, params: dict = None, client_errors: bool = False, arcgis_errors: bool = False):
+        """
+        Makes a rate-limited GET request and returns the decoded JSON, retrying transient failures.
+
+        Args:
+            url (str): The URL to request.
+            params (dict): The query parameters (URL-encoded by requests).
+            client_errors (bool): If True, a 4xx response with a JSON body
+                (other than 429) is returned like a success, for APIs such as
+                OSRM that answer "no route" with a 400 and {"code": "NoRoute"}.
+            arcgis_errors (bool): If True, a JSON body with an "error" member
+                is retried like a retryable status, for ArcGIS REST services,
+                which report failures with a 200 status.
+
+        Returns:
+            The decoded JSON response.
+
+        Raises:
+            requests.RequestException: If the request still fails after
+                every retry, or fails with a non-retryable status.
+        """
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code in RETRY_STATUSES:
+                    raise RetryableError(f"{response.status_code} from {response.url}")
+                if client_errors and 400 <= response.status_code < 500:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        pass
+                response.raise_for_status()
+                data = response.json()
+                if arcgis_errors and 'error' in data:
+                    raise RetryableError(f"ArcGIS error {data['error']} from {response.url}")
+                return data
+            except (requests.ConnectionError, requests.Timeout, RetryableError) as error:
+                if attempt == self.retries:
+                    if isinstance(error, RetryableError):
+                        raise requests.HTTPError(str(error), response=response) from error
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def round_point(self, lon, lat) -> str:
+        """
+        Returns a point as 'lon,lat' rounded to the client's precision, for cache keys.
+        """
+        return f"{float(lon):.{self.precision}f},{float(lat):.{self.precision}f}"
+
+    @abstractmethod
+    def cache_key(self, *query) -> str:
+        """
+        Returns the cache key of a query.
+        """
+
+    @abstractmethod
+    def fetch(self, *query):
+        """
+        Sends one query to the API and returns its result.
+        """
+
+    def lookup(self, *query):
+        """
+        Looks up one query, from the cache when it has a valid entry.
+        """
+        return self.lookup_many([query])[0]
+
+    def lookup_many(self, queries: Iterable[Tuple]) -> List:
+        """
+        Looks up many queries, fetching the ones without a valid cache entry concurrently.
+
+        Queries with the same cache key are only fetched once. Each result is
+        cached as soon as it arrives, so when some lookups fail the others are
+        kept, and a re-run only retries the failures.
+
+        Args:
+            queries (iterable): Tuples of fetch arguments.
+
+        Returns:
+            list: The result of each query, in the same order.
+
+        Raises:
+            Exception: The first failed lookup's error, once every other
+                lookup has finished and been cached.
+        """
+        queries = list(queries)
+        keys = [self.cache_key(*query) for query in queries]
+        namespace = f"{self.CACHE_NAMESPACE}-v{CACHE_VERSION}"
+
+        results = {}
+        if self.cache is not None:
+            for key in set(keys):
+                cached = self.cache.get(namespace, key)
+                if cached is not None:
+                    results[key] = cached
+
+        missing = {}
+        for key, query in zip(keys, queries):
+            if key not in results:
+                missing.setdefault(key, query)
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch, *query): key for key, query in missing.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as error:
+                    errors.append(error)
+                    continue
+                if self.cache is not None:
+                    self.cache.put(namespace, key, results[key])
+
+        if errors:
+            raise errors[0]
+        return [results[key] for key in keys]
+
+
+class FloodZoneClient(LookupClient):
+    """
+    Looks up FEMA flood hazard zones for many points (see LookupClient).
+
+    Cached zones are keyed by the rounded (lon, lat).
+    """
+
+    CACHE_NAMESPACE = 'fema'
+
+    def __init__(self, url: str = FEMA_URL, **kwargs):
+        """
+        Args:
+            url (str): The MapServer layer query URL.
+            **kwargs: The LookupClient options.
+        """
+        super().__init__(url, **kwargs)
+
+    def cache_key(self, lon, lat) -> str:
+        return self.round_point(lon, lat)
+
+    def fetch(self, lon, lat) -> str:
+        """
+        Queries the flood hazard zone subtype at a point.
+
+        Args:
+            lon (float or str): The longitude.
+            lat (float or str): The latitude.
+
+        Returns:
+            str: The ZONE_SUBTY of the first intersecting flood zone, or
+            NO_DATA if there is none or it is empty.
+
+        Raises:
+            requests.HTTPError: If the server keeps answering with an ArcGIS
+                error body, which it sends with a 200 status. The error is
+                retried like a transient failure and never cached as NO_DATA.
+        """
+        query = {
+            'geometry': f'{lon},{lat}',
+            'geometryType': 'esriGeometryPoint',
+            'inSR': '4326',
+            'spatialRel': 'esriSpatialRelIntersects',
+            'outFields': 'ZONE_SUBTY',
+            'returnGeometry': 'false',
+            'f': 'pjson'
+        }
+        data = self.get_json(self.url, query, arcgis_errors=True)
+
+        if 'features' in data and len(data['features']) > 0:
+            return data['features'][0]['attributes']['ZONE_SUBTY'] or NO_DATA
+        return NO_DATA
+
+
+class DriveTimeClient(LookupClient):
+    """
+    Looks up OSRM driving durations between many origin/destination pairs (see LookupClient).
+
+    Cached durations are keyed by the rounded origin and destination.
+    """
+
+    CACHE_NAMESPACE = 'osrm'
+
+    def __init__(self, url: str = OSRM_URL, **kwargs):
+        """
+        Args:
+            url (str): The OSRM driving route service URL.
+            **kwargs: The LookupClient options.
+        """
+        super().__init__(url, **kwargs)
+
+    def cache_key(self, origin, destination) -> str:
+        return f"{self.round_point(*origin)};{self.round_point(*destination)}"
+
+    def fetch(self, origin, destination):
+        """
+        Queries the driving duration of the first route between two points.
+
+        Args:
+            origin (tuple): The (lon, lat) of the start.
+            destination (tuple): The (lon, lat) of the end.
+
+        Returns:
+            float or str: The duration in seconds, or NO_DATA if OSRM found
+            no route or rejected a coordinate (e.g. a point in the ocean or
+            with no roads), which it reports as a 400 with a JSON body.
+        """
+        data = self.get_json(f"{self.url}/{origin[0]},{origin[1]};{destination[0]},{destination[1]}",
+                             {'steps': 'false'}, client_errors=True)
+
+        if 'routes' in data and len(data['routes']) > 0:
+            return data['routes'][0]['duration']
+        return NO_DATA
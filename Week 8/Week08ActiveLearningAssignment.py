@@ -1,94 +1,45 @@
 # TASK 1
 
 from pathlib import Path
-from typing import List
-import csv
 from collections import namedtuple
+from wash_survey import SurveyPipeline
 
 csv_path = Path('/Users/jasonklein/Downloads/IOM_Rohingya_WASH_Survey.csv')
 
-with open(csv_path, 'r', encoding='utf-8-sig') as csv_file:
-    reader = csv.reader(csv_file)
-    headers = next(reader)
+# Run the survey through a staged pipeline: project (read only the columns whose names start with 'G' since these
+# contain WASH data) -> binarize -> encode -> prune -> factor. Each stage saves its output as a columnar file in the
+# artifact directory, so repeat runs only redo the stages whose input or settings changed, and only one stage's
+# data has to be in memory at a time
+pipeline = SurveyPipeline(csv_path, artifact_dir=r"/Users/jasonklein/Downloads/.wash_pipeline", prefix='G',
+                          threshold=0.75, factor_method='scree', rotation="varimax")
 
-    # Filter the header list to only the columns whose names start with 'G' since these contain WASH data
-    g_columns = [col for col in headers if col.startswith('G')]
-    g_indices = [headers.index(col) for col in g_columns]
+# The G columns as one array per column
+survey_columns = pipeline.columns('project')
+g_columns = list(survey_columns)
 
-    # Create a NamedTuple type where the fields match the G columns
-    SurveyRecord = namedtuple('SurveyRecord', field_names=g_columns)
+# Create a NamedTuple type where the fields match the G columns
+SurveyRecord = namedtuple('SurveyRecord', field_names=g_columns)
 
-    survey_table = []
-
-    # Look up the values only for the G columns
-    # Put those values into a NamedTuple (SurveyRecord)
-    # Append that record to survey_table
-    for row in reader:
-        g_row_data = [row[idx] for idx in g_indices]
-        survey_record = SurveyRecord(*g_row_data)
-        survey_table.append(survey_record)
-
-print(survey_table[0])
+# Show the first household's G column values as a NamedTuple (SurveyRecord)
+print(SurveyRecord(*[values[0] for values in survey_columns.values()]))
+del survey_columns
 
 # TASK 2
 
-# Take the list of NamedTuples and return a new one with binary values
-def convert_yesno_to_binary(table: List[tuple]) -> List[tuple]:
-    named_tuple_class = type(table[0])
-    converted_rows = []
-
-    # Convert non-yes to 0 and yes to 1
-    for row in table:
-        row_list = list(row)
-        converted_list = []
-        for value in row_list:
-            if value in ['', 'Do not know', 'No']:
-                converted_list.append(0)
-            elif value == 'Yes':
-                converted_list.append(1)
-            else:
-                converted_list.append(value)
-        # Rebuild the NamedTuple with the binary values
-        converted_rows.append(named_tuple_class(*converted_list))
-
-    return converted_rows
-
-binary_survey_table = convert_yesno_to_binary(survey_table)
-print(binary_survey_table[0])
+# Convert non-yes answers ('', 'Do not know', 'No') to 0 and 'Yes' to 1 (YES_NO_CODES); other answers are kept
+# for now and numbered in Task 3
+binary_columns = pipeline.columns('binarize')
+print(SurveyRecord(*[values[0] for values in binary_columns.values()]))
+del binary_columns
 
 # TASK 3
 
-def convert_values_to_numeric(table: List[tuple]) -> List[tuple]:
-    # Get the NamedTuple type and all column names
-    named_tuple_class = type(table[0])
-    column_name_list = named_tuple_class._fields
-
-    numeric_column_list = []
-    for column_name in column_name_list:
-       # Get all values for the current column
-        column_values = [getattr(row, column_name) for row in table]
-
-        # Find all values that are not already numeric
-        unique_non_numeric_column_values = set(
-            [v for v in column_values if not isinstance(v, (int, float, complex))]
-        )
-
-        # Create and apply mapping (Get the index and value for the unique item)
-        map_dict = {unique_value: idx for idx, unique_value in enumerate(unique_non_numeric_column_values)}
-
-        numeric_column_values = [
-            map_dict[val] if val in map_dict else val for val in column_values
-        ]
-
-        numeric_column_list.append(numeric_column_values)
-
-   # Combine all converted columns back into rows using zip and rebuild the rows as NamedTuples
-    numeric_row_table = list(zip(*numeric_column_list))
-    numeric_tuple_table = [named_tuple_class(*row) for row in numeric_row_table]
-    return numeric_tuple_table
-
-final_converted_table = convert_values_to_numeric(binary_survey_table)
-print(final_converted_table[0])
+# Encode every column: yes/no answers get their binary code and each remaining answer in a column gets a number
+# (0, 1, 2, ... in sorted order, so the numbers are the same on every run). encoded_columns maps each G column to
+# an integer array
+encoded_columns = pipeline.columns('encode')
+print(SurveyRecord(*[int(codes[0]) for codes in encoded_columns.values()]))
+del encoded_columns
 
 #TASK 4
 
@@ -105,58 +56,40 @@ The solution is to detect and remove highly correlated columns before running fa
 # TASK 5
 
 import pandas as pd
-import numpy as np
-
-# Create a pandas DataFrame from the cleaned NamedTuples
-df = pd.DataFrame(final_converted_table)
-
-# Calculate a correlation matrix for all numeric columns
-corr_matrix = df.corr()
-
-# Keep only the upper triangle of the correlation matrix to avoid duplicates
-upper = np.triu(np.ones(corr_matrix.shape), k=1).astype(bool)
-upper_corr = corr_matrix.where(upper)
 
-# Identify columns that are correlated above 0.75 with another column to be removed
-to_drop = [col for col in upper_corr.columns if any(upper_corr[col] > 0.75)]
-
-df_reduced = df.drop(columns=to_drop)
+# Remove columns that are correlated above 0.75 with an earlier column, and identify the zero-variance columns, in
+# one pass. Correlations are computed in blocks of columns instead of as one full correlation matrix
+df_reduced = pd.DataFrame(pipeline.columns('prune'))
 
 # Show the number of NaNs and a sample of the reduced DataFrame
 print(df_reduced.isna().sum())
 print(df_reduced.head())
-
-# Remove zero-variance columns
-df_fixed = df_reduced.loc[:, df_reduced.var() > 0]
+del df_reduced
 
 """
 The NaN table represents the correlation matrix after the library tries to invert it, and the NaNs indicate columns that 
 were too correlated to remain in the dataset.
 
-To fix this, I removed the highly correlated columns and also filtered out any zero-variance columns. This produces a 
-DataFrame called `df_fixed` that can successfully be used in factor analysis.
+To fix this, I removed the highly correlated columns and also filtered out any zero-variance columns. The pipeline's 
+factor stage drops the zero-variance columns from the reduced data, which can then successfully be used in factor 
+analysis.
 """
 
 # TASK 6
 
-from factor_analyzer import FactorAnalyzer
-
-# Create factor analysis object and perform initial factor analysis
-fa = FactorAnalyzer(rotation="varimax")
-fa.fit(df_fixed)
-
-# Perform factor analysis with the determined number of factors
-number_of_factors = 5
-fa = FactorAnalyzer(n_factors=number_of_factors, rotation="varimax")
-fa.fit(df_fixed)
+# Drop the zero-variance columns, compute the correlation matrix and its eigenvalues once, determine the number of
+# factors from the elbow of the scree plot, and fit only that final varimax model (the pipeline's factor stage)
+factor_result = pipeline.factor_result()
+number_of_factors = factor_result.N_Factors
+print(f"Number of factors: {number_of_factors}")
 
 # Create factor names
 factor_names = [f'Factor{i+1}' for i in range(number_of_factors)]
 
 # Loadings DataFrame
-loadings_df = pd.DataFrame(fa.loadings_,
+loadings_df = pd.DataFrame(factor_result.Loadings,
                            columns=factor_names,
-                           index=df_fixed.columns)
+                           index=factor_result.Columns)
 
 # Get variance of each factor
 index_names = [
@@ -165,7 +98,7 @@ index_names = [
     'Cumulative Variance'
 ]
 
-variance_df = pd.DataFrame(fa.get_factor_variance(),
+variance_df = pd.DataFrame(factor_result.Variance,
                            columns=factor_names,
                            index=index_names)
 
@@ -0,0 +1,84 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from wash_survey import prune_correlated_columns
+
+
+def generate_survey_frame(row_count, column_count, seed=0):
+    """
+    Generates a synthetic encoded survey: yes/no indicator columns driven by a
+    handful of latent factors, with some near-duplicate and constant columns.
+    """
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(row_count, 8))
+    loadings = rng.normal(size=(8, column_count)) * (rng.random((8, column_count)) < 0.3)
+    scores = latent @ loadings + rng.normal(size=(row_count, column_count))
+    data = (scores > 0).astype(np.int64)
+
+    # Near duplicates of earlier columns, which the pruning has to catch
+    for column in rng.choice(np.arange(1, column_count), size=column_count // 20, replace=False):
+        source = rng.integers(0, column)
+        flips = rng.random(row_count) < 0.05
+        data[:, column] = np.where(flips, 1 - data[:, source], data[:, source])
+
+    # Constant columns
+    data[:, rng.choice(column_count, size=max(column_count // 100, 1), replace=False)] = 0
+
+    return pd.DataFrame(data, columns=[f"G{index:04d}" for index in range(column_count)])
+
+
+def prune_with_pandas(df, threshold=0.75):
+    """
+    The original Task 5 path: full df.corr(), upper-triangle mask, per-column scan, then var() > 0.
+    """
+    corr_matrix = df.corr()
+    upper = np.triu(np.ones(corr_matrix.shape), k=1).astype(bool)
+    upper_corr = corr_matrix.where(upper)
+    to_drop = [col for col in upper_corr.columns if any(upper_corr[col] > threshold)]
+
+    df_reduced = df.drop(columns=to_drop)
+    zero_variance = [col for col in df_reduced.columns if not df_reduced[col].var() > 0]
+    return to_drop, zero_variance
+
+
+def benchmark_pruning(row_count, column_counts):
+    """
+    Times the pandas path against prune_correlated_columns and checks they drop the same columns.
+    """
+    print(f"{'Rows':>8} {'Columns':>8} {'pandas (s)':>11} {'blocked (s)':>12} {'Speedup':>8} {'Dropped':>8}")
+    for column_count in column_counts:
+        df = generate_survey_frame(row_count, column_count)
+
+        start = time.perf_counter()
+        expected = prune_with_pandas(df)
+        pandas_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = prune_correlated_columns(df)
+        blocked_time = time.perf_counter() - start
+
+        if result != expected:
+            raise AssertionError(f"Pruning results differ for {column_count} columns")
+
+        print(f"{row_count:>8,} {column_count:>8,} {pandas_time:>11.2f} {blocked_time:>12.2f} "
+              f"{pandas_time / blocked_time:>7.1f}x {len(result[0]):>8,}")
+
+
+def main():
+    """
+    Benchmarks correlation pruning of the Week 8 WASH survey columns.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__.strip())
+    parser.add_argument('columns', nargs='*', type=int, default=[250, 1000, 2000],
+                        help="column counts to benchmark (default: 250, 1000 and 2000)")
+    parser.add_argument('--rows', type=int, default=5000, help="survey rows (default: 5000)")
+    args = parser.parse_args()
+
+    benchmark_pruning(args.rows, args.columns)
+
+
+if __name__ == "__main__":
+    main()
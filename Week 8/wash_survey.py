@@ -0,0 +1,593 @@
+import hashlib
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from factor_analyzer import FactorAnalyzer
+
+# Bump when the factor analysis setup changes so cached fits are recomputed
+FACTOR_VERSION = 1
+
+# Bump when a SurveyPipeline stage changes so its artifacts (and every later stage's) are rebuilt
+PIPELINE_VERSION = 1
+
+# SurveyPipeline stages in order; each stage reads the artifact of the one before it
+PIPELINE_STAGES = ('project', 'binarize', 'encode', 'prune', 'factor')
+
+# Result of run_factor_analysis: the retained factor count, the correlation matrix eigenvalues (largest first),
+# the (columns x factors) loadings and the (3 x factors) sum of squared loadings / proportional / cumulative variance
+FactorResult = namedtuple('FactorResult', ['N_Factors', 'Eigenvalues', 'Loadings', 'Variance', 'Columns'])
+
+# Binary codes for yes/no answers: 'Yes' is 1 and any non-yes answer is 0
+YES_NO_CODES = {'': 0, 'Do not know': 0, 'No': 0, 'Yes': 1}
+
+
+def _read_projected_csv(csv_path, prefix: str, chunk_size: Optional[int] = None):
+    """
+    Opens a survey CSV with pandas' C parser, keeping only the prefixed columns.
+
+    usecols makes the parser skip converting every other column, and
+    na_filter=False keeps every value as the original string ('' stays '').
+    """
+    return pd.read_csv(
+        csv_path,
+        encoding='utf-8-sig',
+        usecols=lambda name: name.startswith(prefix),
+        dtype=str,
+        na_filter=False,
+        chunksize=chunk_size
+    )
+
+
+def _frame_to_columns(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+    return {name: frame[name].to_numpy(dtype=object) for name in frame.columns}
+
+
+def iter_column_chunks(csv_path, prefix: str = 'G', chunk_size: int = 10000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Streams the prefixed columns of a survey CSV in chunks of rows.
+
+    Only one chunk of the projected columns is held at a time, so surveys
+    larger than memory can be processed chunk by chunk.
+
+    Args:
+        csv_path (str or Path): The survey CSV file.
+        prefix (str): The column name prefix to keep ('G' for the WASH questions).
+        chunk_size (int): The number of rows per chunk.
+
+    Yields:
+        dict: A dictionary mapping each column name to an object array of
+        its string values in the chunk.
+    """
+    with _read_projected_csv(csv_path, prefix, chunk_size) as chunks:
+        for frame in chunks:
+            yield _frame_to_columns(frame)
+
+
+def read_columns(csv_path, prefix: str = 'G', chunk_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Reads the prefixed columns of a survey CSV into one array per column.
+
+    Args:
+        csv_path (str or Path): The survey CSV file.
+        prefix (str): The column name prefix to keep ('G' for the WASH questions).
+        chunk_size (int): If given, read this many rows at a time, which
+            bounds the parser's working memory on very large surveys.
+
+    Returns:
+        dict: A dictionary mapping each column name, in file order, to an
+        object array of its string values.
+    """
+    if chunk_size is None:
+        return _frame_to_columns(_read_projected_csv(csv_path, prefix))
+
+    chunks = list(iter_column_chunks(csv_path, prefix, chunk_size))
+    if len(chunks) == 1:
+        return chunks[0]
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+def _file_digest(path) -> str:
+    """
+    Computes the SHA-256 hash of a file's contents, reading it in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source_file:
+        for chunk in iter(lambda: source_file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _dictionary_arrays(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Dictionary-encodes string columns as arrays for an .npz file.
+
+    Returns:
+        dict: The column names under 'columns', and each column's sorted
+        distinct strings and the smallest-width integer codes indexing them
+        under 'categories_<i>' and 'codes_<i>'.
+    """
+    arrays = {'columns': np.array(list(columns), dtype=np.str_)}
+    for index, values in enumerate(columns.values()):
+        categories, codes = np.unique(np.asarray(values).astype(np.str_), return_inverse=True)
+        arrays[f"categories_{index}"] = categories
+        arrays[f"codes_{index}"] = codes.astype(np.min_scalar_type(max(len(categories) - 1, 0)))
+    return arrays
+
+
+def _decode_dictionary_arrays(arrays) -> Dict[str, np.ndarray]:
+    """
+    Turns dictionary-encoded arrays (see _dictionary_arrays) back into columns of strings.
+    """
+    return {
+        str(name): arrays[f"categories_{index}"][arrays[f"codes_{index}"]].astype(object)
+        for index, name in enumerate(arrays['columns'])
+    }
+
+
+def encode_column(values: np.ndarray, binary_codes: Dict[str, int] = YES_NO_CODES) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Encodes one survey column as integers.
+
+    Yes/no answers get their binary code and every other answer is
+    dictionary-encoded as 0, 1, 2, ... in sorted order, so the same data
+    always gets the same codes. The work is done on the column's distinct
+    values: pd.factorize hashes the column once, only the (few) distinct
+    answers are sorted and coded, and the codes are spread back to every
+    row with a single gather.
+
+    Args:
+        values (np.ndarray): The column's string values.
+        binary_codes (dict): The fixed codes for yes/no answers.
+
+    Returns:
+        tuple: The integer codes as a NumPy array, and a dictionary mapping
+        each distinct answer in the column to its code.
+    """
+    factor_codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+
+    category_codes = {}
+    next_code = 0
+    for value in sorted(uniques.tolist()):
+        if value in binary_codes:
+            category_codes[value] = binary_codes[value]
+        else:
+            category_codes[value] = next_code
+            next_code += 1
+
+    unique_codes = np.array([category_codes[value] for value in uniques.tolist()], dtype=np.int64)
+    return unique_codes[factor_codes], category_codes
+
+
+def encode_columns(columns: Dict[str, np.ndarray],
+                   binary_codes: Dict[str, int] = YES_NO_CODES) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, int]]]:
+    """
+    Converts yes/no answers to binary and dictionary-encodes every other answer, column by column.
+
+    Args:
+        columns (dict): A dictionary mapping column names to arrays of
+            string values (as returned by read_columns).
+        binary_codes (dict): The fixed codes for yes/no answers.
+
+    Returns:
+        tuple: A dictionary of integer-coded columns, and a dictionary
+        mapping each column name to its {answer: code} dictionary.
+    """
+    coded_columns = {}
+    categories = {}
+    for name, values in columns.items():
+        coded_columns[name], categories[name] = encode_column(values, binary_codes)
+    return coded_columns, categories
+
+
+def _unit_columns(data, names: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Centers each column and scales it to unit length, so a dot product of two columns is their correlation.
+
+    Returns:
+        tuple: The float32 (rows x columns) matrix of unit columns, the
+        float64 sample variance of each column, and its float64 sum of
+        squared deviations (zero-variance columns are left as zeros).
+    """
+    row_count = len(data[names[0]]) if names else 0
+    unit = np.zeros((row_count, len(names)), dtype=np.float32)
+    variances = np.full(len(names), np.nan)
+    norms = np.zeros(len(names))
+
+    for index, name in enumerate(names):
+        centered = np.asarray(data[name], dtype=np.float64)
+        centered = centered - centered.mean() if row_count else centered
+        norms[index] = np.sqrt(np.dot(centered, centered))
+        if row_count > 1:
+            variances[index] = norms[index] ** 2 / (row_count - 1)
+        if norms[index] > 0:
+            unit[:, index] = centered / norms[index]
+
+    return unit, variances, norms
+
+
+def prune_correlated_columns(data, threshold: float = 0.75, block_size: int = 256,
+                             tolerance: float = 1e-3) -> Tuple[List[str], List[str]]:
+    """
+    Finds the columns to remove before factor analysis, without building the full correlation matrix.
+
+    A column is dropped if its Pearson correlation with any earlier column is
+    above the threshold (the same rule as scanning the upper triangle of
+    df.corr()). Correlations are computed a block of columns at a time as
+    float32 matrix products of unit-length columns, so memory is
+    O(columns x block_size) instead of O(columns^2). Correlations within
+    tolerance of the threshold are recomputed in float64 so float32
+    rounding never changes the result.
+
+    Zero-variance columns (which have no defined correlation and are never
+    dropped for correlation) are found in the same pass.
+
+    Args:
+        data (dict or pd.DataFrame): Numeric columns by name, with no
+            missing values.
+        threshold (float): The correlation above which a column is dropped.
+        block_size (int): The number of columns correlated at once.
+        tolerance (float): How close to the threshold a float32 correlation
+            must be to be rechecked in float64.
+
+    Returns:
+        tuple: The names of the correlated columns to drop, and the names of
+        the zero-variance columns (not among those dropped).
+    """
+    names = list(data.keys())
+    unit, variances, norms = _unit_columns(data, names)
+    drop = np.zeros(len(names), dtype=bool)
+
+    for start in range(0, len(names), block_size):
+        stop = min(start + block_size, len(names))
+
+        # Correlations of every column up to this block with each column in the block,
+        # keeping only earlier columns (the upper triangle)
+        block_corr = unit[:, :stop].T @ unit[:, start:stop]
+        earlier = np.arange(stop)[:, np.newaxis] < np.arange(start, stop)[np.newaxis, :]
+
+        drop[start:stop] = ((block_corr > threshold + tolerance) & earlier).any(axis=0)
+
+        borderline = (np.abs(block_corr - threshold) <= tolerance) & earlier
+        for offset in np.flatnonzero(borderline.any(axis=0) & ~drop[start:stop]):
+            column = start + offset
+            for other in np.flatnonzero(borderline[:, offset]):
+                if _exact_correlation(data, names, norms, other, column) > threshold:
+                    drop[column] = True
+                    break
+
+    zero_variance = ~(variances > 0) & ~drop
+    return ([name for name, dropped in zip(names, drop) if dropped],
+            [name for name, zero in zip(names, zero_variance) if zero])
+
+
+def _exact_correlation(data, names: List[str], norms: np.ndarray, first: int, second: int) -> float:
+    first_values = np.asarray(data[names[first]], dtype=np.float64)
+    second_values = np.asarray(data[names[second]], dtype=np.float64)
+    covariance = np.dot(first_values - first_values.mean(), second_values - second_values.mean())
+    return covariance / (norms[first] * norms[second])
+
+
+def _data_digest(values: np.ndarray, columns: List[str]) -> str:
+    """
+    Returns a SHA-256 hex digest of a numeric data matrix and its column names.
+    """
+    digest = hashlib.sha256(json.dumps(columns).encode())
+    digest.update(str(values.shape).encode())
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def choose_factor_count(eigenvalues: np.ndarray, method: str = 'kaiser') -> int:
+    """
+    Chooses how many factors to retain from the correlation matrix eigenvalues.
+
+    Args:
+        eigenvalues (np.ndarray): The eigenvalues, largest first.
+        method (str): 'kaiser' keeps every factor with an eigenvalue above 1;
+            'scree' keeps the factors before the elbow of the scree plot (the
+            eigenvalue where the curve bends the most, i.e. the largest
+            second difference).
+
+    Returns:
+        int: The number of factors (at least 1).
+    """
+    if method == 'kaiser':
+        return max(int(np.count_nonzero(eigenvalues > 1)), 1)
+    if method == 'scree':
+        if len(eigenvalues) < 3:
+            return 1
+        second_differences = eigenvalues[:-2] - 2 * eigenvalues[1:-1] + eigenvalues[2:]
+        return max(int(np.argmax(second_differences)) + 1, 1)
+    raise ValueError(f"Unknown factor count method: {method}")
+
+
+def run_factor_analysis(data, n_factors: Optional[int] = None, method: str = 'kaiser', rotation: str = 'varimax',
+                        cache_dir=None, **factor_kwargs) -> FactorResult:
+    """
+    Runs factor analysis with a single model fit, caching the result.
+
+    The correlation matrix and its eigenvalues are computed once. Unless
+    n_factors is given, the number of factors is chosen from the eigenvalues
+    (see choose_factor_count), and only that final model is fitted, directly
+    on the correlation matrix. With a cache_dir, the eigenvalues are cached by
+    dataset hash and each fitted result by dataset hash plus parameters, so
+    re-running the analysis, or trying another rotation on the same data,
+    skips work that was already done.
+
+    Args:
+        data (dict or pd.DataFrame): Numeric columns by name.
+        n_factors (int): The number of factors, or None to choose it.
+        method (str): How to choose the number of factors ('kaiser' or 'scree').
+        rotation (str): The FactorAnalyzer rotation.
+        cache_dir (str or Path): The directory for cached results, or None
+            to disable caching.
+        **factor_kwargs: Other FactorAnalyzer arguments (e.g. method='ml').
+
+    Returns:
+        FactorResult: The factor count, eigenvalues, loadings, factor
+        variance and column names.
+    """
+    columns = [str(name) for name in data.keys()]
+    values = np.column_stack([np.asarray(data[name], dtype=np.float64) for name in data.keys()])
+    data_hash = _data_digest(values, columns)
+    cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    corr_matrix = None
+    eigen_path = cache_dir / f"eigenvalues-{data_hash[:32]}.npy" if cache_dir is not None else None
+    if eigen_path is not None and eigen_path.exists():
+        eigenvalues = np.load(eigen_path)
+    else:
+        corr_matrix = np.corrcoef(values, rowvar=False)
+        eigenvalues = np.linalg.eigvalsh(corr_matrix)[::-1]
+        if eigen_path is not None:
+            _save_atomic(eigen_path, lambda path: np.save(path, eigenvalues))
+
+    if n_factors is None:
+        n_factors = choose_factor_count(eigenvalues, method)
+
+    parameters = json.dumps({'n_factors': n_factors, 'rotation': rotation, 'version': FACTOR_VERSION,
+                             **factor_kwargs}, sort_keys=True, default=str)
+    fit_hash = hashlib.sha256(f"{data_hash}{parameters}".encode()).hexdigest()
+    fit_path = cache_dir / f"factors-{fit_hash[:32]}.npz" if cache_dir is not None else None
+
+    if fit_path is not None and fit_path.exists():
+        with np.load(fit_path) as cached:
+            return FactorResult(n_factors, eigenvalues, cached['loadings'], cached['variance'], columns)
+
+    if corr_matrix is None:
+        corr_matrix = np.corrcoef(values, rowvar=False)
+    analyzer = FactorAnalyzer(n_factors=n_factors, rotation=rotation, is_corr_matrix=True, **factor_kwargs)
+    analyzer.fit(corr_matrix)
+    result = FactorResult(n_factors, eigenvalues, analyzer.loadings_, np.array(analyzer.get_factor_variance()),
+                          columns)
+
+    if fit_path is not None:
+        _save_atomic(fit_path, lambda path: np.savez(path, loadings=result.Loadings, variance=result.Variance))
+    return result
+
+
+def _save_atomic(path: Path, save) -> None:
+    """
+    Writes a cache file through a temporary file so an interrupted run never leaves a partial file behind.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    save(temp_path)
+    os.replace(temp_path, path)
+
+
+class SurveyPipeline:
+    """
+    Staged WASH survey pipeline with an on-disk columnar artifact per stage.
+
+    The stages (PIPELINE_STAGES) are:
+        project: read the prefixed columns of the CSV, dictionary-encoded as
+            integer codes plus the sorted distinct answers they index.
+        binarize: give each distinct answer its yes/no code (-1 for answers
+            that aren't yes/no).
+        encode: code each column's distinct answers with encode_columns
+            and spread the codes to every row with one gather.
+        prune: drop the columns correlated above the threshold with an
+            earlier column, and find the zero-variance columns.
+        factor: run factor analysis on the pruned, non-constant columns.
+
+    Each stage's output is saved as an .npz file named after a key that
+    chains the CSV's hash, every earlier stage's settings and its own, so
+    changing a setting only invalidates that stage and the ones after it.
+    Running a stage resumes from the latest valid artifact before it, and each
+    stage only holds its input and output, so peak memory is one stage's
+    working set.
+    """
+
+    def __init__(self, csv_path, artifact_dir=None, prefix: str = 'G',
+                 binary_codes: Dict[str, int] = YES_NO_CODES, threshold: float = 0.75,
+                 n_factors: Optional[int] = None, factor_method: str = 'kaiser', rotation: str = 'varimax'):
+        """
+        Args:
+            csv_path (str or Path): The survey CSV file.
+            artifact_dir (str or Path): The directory holding stage artifacts
+                (defaults to a '.wash_pipeline' directory next to the CSV).
+            prefix (str): The column name prefix to keep.
+            binary_codes (dict): The fixed codes for yes/no answers.
+            threshold (float): The correlation above which a column is pruned.
+            n_factors (int): The number of factors, or None to choose it.
+            factor_method (str): How to choose the number of factors ('kaiser'
+                or 'scree').
+            rotation (str): The FactorAnalyzer rotation.
+        """
+        self.csv_path = Path(csv_path)
+        self.artifact_dir = (Path(artifact_dir) if artifact_dir is not None
+                             else self.csv_path.parent / '.wash_pipeline')
+        self.settings = {
+            'project': {'prefix': prefix},
+            'binarize': {'binary_codes': binary_codes},
+            'encode': {},
+            'prune': {'threshold': threshold},
+            'factor': {'n_factors': n_factors, 'method': factor_method, 'rotation': rotation},
+        }
+        self._keys = None
+
+    def stage_keys(self) -> Dict[str, str]:
+        """
+        Returns each stage's SHA-256 artifact key, which changes whenever the CSV or an earlier setting changes.
+
+        The CSV is hashed once, on first use, so a pipeline created before the
+        CSV is edited keeps using the old artifacts.
+        """
+        if self._keys is None:
+            keys = {}
+            previous = _file_digest(self.csv_path)
+            for stage in PIPELINE_STAGES:
+                parameters = json.dumps([previous, stage, self.settings[stage], PIPELINE_VERSION], sort_keys=True)
+                previous = keys[stage] = hashlib.sha256(parameters.encode()).hexdigest()
+            self._keys = keys
+        return self._keys
+
+    def artifact_path(self, stage: str, keys: Optional[Dict[str, str]] = None) -> Path:
+        """
+        Returns the path of a stage's artifact (which may not exist yet).
+        """
+        keys = self.stage_keys() if keys is None else keys
+        return self.artifact_dir / f"{self.csv_path.stem}-{stage}-{keys[stage][:32]}.npz"
+
+    def run(self, stage: str = 'factor') -> Path:
+        """
+        Brings a stage's artifact up to date, rerunning only the stages whose artifacts are missing or stale.
+
+        Args:
+            stage (str): The last stage to run (one of PIPELINE_STAGES).
+
+        Returns:
+            Path: The stage's artifact.
+        """
+        if stage not in PIPELINE_STAGES:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        keys = self.stage_keys()
+        target = PIPELINE_STAGES.index(stage)
+
+        start = target
+        while start >= 0 and not self.artifact_path(PIPELINE_STAGES[start], keys).exists():
+            start -= 1
+        if start == target:
+            return self.artifact_path(stage, keys)
+
+        arrays = self._load(self.artifact_path(PIPELINE_STAGES[start], keys)) if start >= 0 else None
+        for name in PIPELINE_STAGES[start + 1:target + 1]:
+            # Rebinding drops the previous stage's arrays once this stage's output exists
+            arrays = getattr(self, f"_{name}")(arrays)
+            _save_atomic(self.artifact_path(name, keys), lambda path: np.savez(path, **arrays))
+
+        return self.artifact_path(stage, keys)
+
+    def load(self, stage: str, names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Runs the pipeline up to a stage and returns the raw arrays of its artifact.
+
+        Args:
+            stage (str): The stage (one of PIPELINE_STAGES).
+            names (list): The arrays to read, or None for all of them (.npz
+                members are read individually, so the others are never loaded).
+
+        Returns:
+            dict: A dictionary mapping array names to NumPy arrays.
+        """
+        return self._load(self.run(stage), names)
+
+    def columns(self, stage: str) -> Dict[str, np.ndarray]:
+        """
+        Runs the pipeline up to a stage and returns its output as a dictionary of columns.
+
+        Args:
+            stage (str): 'project' for string columns, 'binarize' for columns
+                with yes/no answers as their binary codes and every other
+                answer still a string, 'encode' for every integer-coded
+                column, or 'prune' for the integer-coded columns that survive
+                correlation pruning.
+
+        Returns:
+            dict: A dictionary mapping column names to NumPy arrays.
+        """
+        arrays = self.load(stage)
+        if stage == 'project':
+            return _decode_dictionary_arrays(arrays)
+        if stage == 'binarize':
+            columns = {}
+            for index, name in enumerate(arrays['columns']):
+                answers = np.array([code if code >= 0 else answer for answer, code in
+                                    zip(arrays[f"categories_{index}"].tolist(), arrays[f"binary_{index}"].tolist())],
+                                   dtype=object)
+                columns[str(name)] = answers[arrays[f"codes_{index}"]]
+            return columns
+        if stage in ('encode', 'prune'):
+            return {str(name): arrays[f"values_{index}"] for index, name in enumerate(arrays['columns'])}
+        raise ValueError(f"The {stage} stage has no columns")
+
+    def pruned_columns(self) -> Tuple[List[str], List[str]]:
+        """
+        Runs the pipeline up to the prune stage and returns the names of the correlated and zero-variance columns.
+        """
+        arrays = self.load('prune', ['dropped', 'zero_variance'])
+        return [str(name) for name in arrays['dropped']], [str(name) for name in arrays['zero_variance']]
+
+    def factor_result(self) -> FactorResult:
+        """
+        Runs the whole pipeline and returns the factor analysis result.
+        """
+        arrays = self.load('factor')
+        return FactorResult(int(arrays['n_factors']), arrays['eigenvalues'], arrays['loadings'],
+                            arrays['variance'], [str(name) for name in arrays['columns']])
+
+    @staticmethod
+    def _load(path: Path, names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        with np.load(path) as artifact:
+            return {name: artifact[name] for name in (artifact.files if names is None else names)}
+
+    def _project(self, _) -> Dict[str, np.ndarray]:
+        return _dictionary_arrays(read_columns(self.csv_path, **self.settings['project']))
+
+    def _binarize(self, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        binary_codes = self.settings['binarize']['binary_codes']
+        for index in range(len(arrays['columns'])):
+            arrays[f"binary_{index}"] = np.array([binary_codes.get(value, -1)
+                                                  for value in arrays[f"categories_{index}"].tolist()], dtype=np.int8)
+        return arrays
+
+    def _encode(self, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        # Encoding the distinct answers gives each one its code; the rows then just index them
+        categories = {str(name): arrays[f"categories_{index}"] for index, name in enumerate(arrays['columns'])}
+        category_codes, _ = encode_columns(categories, self.settings['binarize']['binary_codes'])
+
+        encoded = {'columns': arrays['columns']}
+        for index, name in enumerate(categories):
+            encoded[f"categories_{index}"] = categories[name]
+            encoded[f"category_codes_{index}"] = category_codes[name]
+            encoded[f"values_{index}"] = category_codes[name][arrays[f"codes_{index}"]]
+        return encoded
+
+    def _prune(self, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        data = {str(name): arrays[f"values_{index}"] for index, name in enumerate(arrays['columns'])}
+        to_drop, zero_variance = prune_correlated_columns(data, **self.settings['prune'])
+
+        dropped = set(to_drop)
+        kept = [name for name in data if name not in dropped]
+        pruned = {'columns': np.array(kept, dtype=np.str_),
+                  'dropped': np.array(to_drop, dtype=np.str_),
+                  'zero_variance': np.array(zero_variance, dtype=np.str_)}
+        for index, name in enumerate(kept):
+            pruned[f"values_{index}"] = data[name]
+        return pruned
+
+    def _factor(self, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        zero_variance = set(arrays['zero_variance'].tolist())
+        data = {str(name): arrays[f"values_{index}"] for index, name in enumerate(arrays['columns'])
+                if name not in zero_variance}
+
+        result = run_factor_analysis(data, **self.settings['factor'])
+        return {'n_factors': np.array(result.N_Factors), 'eigenvalues': result.Eigenvalues,
+                'loadings': result.Loadings, 'variance': result.Variance,
+                'columns': np.array(result.Columns, dtype=np.str_)}
@@ -1,81 +1,31 @@
 import csv
-from datetime import datetime
 import numpy as np
 import matplotlib.pyplot as plt
-from openpyxl import load_workbook
-from scipy.optimize import curve_fit
+from pipe_survival import cumulative_density_function, load_coefficients, load_training_data
 
 # TASK 1
 
 # Define the path to the Excel file containing pipe material training data
 pipe_material_excel_path = ('/Users/jasonklein/Downloads/Pipe_Material_Training_Data.xlsx')
 
-# Load the Excel workbook into memory
-workbook = load_workbook(pipe_material_excel_path)
+# The Weibull Cumulative Distribution Function (CDF), which models the probability of failure by a given age, is
+# imported from pipe_survival
 
-# Access the specific sheet named "Survival Probabilities"
-sheet = workbook["Survival Probabilities"]
+# Stream the rows of the "Survival Probabilities" sheet from the workbook (opened read-only, so the rest of the
+# workbook is never loaded), splitting them into ages and failure probabilities (CDF values) per material in one pass
+training_data = load_training_data(pipe_material_excel_path, "Survival Probabilities")
 
-# Define the Weibull Cumulative Distribution Function (CDF)
-# This function models the probability of failure by a given age
-"""
-Calculates the failure probability (CDF) at age x given parameters c, b, and a. The training data provides survival percentages, 
-but curve fitting needs failure probabilities, so we convert:
-From data: Survival = 95% → Failure = 5%
-Mathematically: Failure = 1 - Survival
- """
-def cumulative_density_function(x, c, b, a):
-    # x = age, a = shape parameter (controls curve steepness),
-    # b = scale parameter (controls lifespan length),
-    # c = initial survival multiplier (vertical scaling)
-    return 1 - c * np.exp(-((x / b) ** a))  # Returns failure probability by age x
-
-# Define a function to fit and plot the Weibull CDF for a specific pipe material
-def plot_cdf_curve_fit(table, material_type, line_color):
-    X_train = []  # List to store pipe ages (Life Expectancy)
-    Y_train = []  # List to store failure probabilities (CDF values)
-
-    # Iterate through each row in the Excel sheet
-    for row in table.iter_rows(values_only=True):
-        # Unpack row into material, life expectancy, and survival percentage
-        mat, life, surv = row
-        # Skip the header row
-        if mat == "Material Type":
-            continue
-
-        # Only process rows matching the specified material type
-        if mat == material_type:
-            # Skip invalid rows where life expectancy is non-positive
-            if float(life) <= 0:
-                continue
-
-            # Convert survival percentage to failure probability (CDF)
-            cdf_value = 1 - float(surv) / 100
-
-            # Add to training lists
-            X_train.append(float(life))
-            Y_train.append(cdf_value)
-
-    # Convert lists to NumPy arrays for numerical operations
-    X_train = np.array(X_train)
-    Y_train = np.array(Y_train)
-
-    # Handle case where all Y values are identical (e.g., Copper data)
-    # Add small noise to allow curve fitting
-    if np.all(Y_train == Y_train[0]):
-        Y_train = Y_train + 0.001 * np.arange(len(Y_train))
-
-    # Fit the Weibull model to the training data
-    coeffs, _ = curve_fit(
-        cumulative_density_function,  # The model function
-        X_train,  # Age data
-        Y_train,  # Failure probability data
-        p0=[1, 50, 2],  # Initial guess for c, b, a
-        maxfev=20000  # Maximum function evaluations
-    )
+# Fitted Weibull coefficients (c, b, a) for each material. They are cached next to the workbook with a hash of the
+# training data, so the curves are only refit when the training data changes
+coefficient_cache_path = pipe_material_excel_path.replace('.xlsx', '_coefficients.json')
+coefficients = load_coefficients(training_data, coefficient_cache_path)
+
+# Define a function to plot the fitted Weibull CDF for a specific pipe material
+def plot_cdf_curve_fit(training_data, coefficients, material_type, line_color):
+    X_train, _ = training_data[material_type]  # Pipe ages (Life Expectancy) from the training data
 
     # Unpack fitted coefficients
-    c, b, a = coeffs
+    c, b, a = coefficients[material_type]
     # Print fitted parameters for debugging/verification
     print(f"{material_type}: c={c:.4f}, b={b:.4f}, a={a:.4f}")
 
@@ -89,11 +39,11 @@ def plot_cdf_curve_fit(table, material_type, line_color):
     # Plot the survival curve
     plt.plot(x_vals, survival_vals, color=line_color, label=material_type)
 
-# Fit and plot survival curves for each material type
-plot_cdf_curve_fit(sheet, "Cast Iron", "red")
-plot_cdf_curve_fit(sheet, "Ductile Iron", "blue")
-plot_cdf_curve_fit(sheet, "Galvanized Iron", "green")
-plot_cdf_curve_fit(sheet, "Copper", "brown")
+# Plot survival curves for each material type
+plot_cdf_curve_fit(training_data, coefficients, "Cast Iron", "red")
+plot_cdf_curve_fit(training_data, coefficients, "Ductile Iron", "blue")
+plot_cdf_curve_fit(training_data, coefficients, "Galvanized Iron", "green")
+plot_cdf_curve_fit(training_data, coefficients, "Copper", "brown")
 
 # Add chart elements
 plt.legend()
@@ -104,34 +54,23 @@ plt.grid(True)
 plt.show()
 
 # TASK 2
-# Import additional libraries for data structures and math operations
-from collections import namedtuple
-import math
-
-# Define a function to compute survival probability using Weibull formula
-def weibull_survival(age, c, b, a):
-    return c * math.exp(-((age / b) ** a)) * 100  # Returns survival probability as a percentage
-
-# Dictionary of fitted Weibull coefficients from Task 1 for each material (acts as a material-to-parameter lookup table)
-coefficients = {
-    "Cast Iron": (1.0236, 91.2607, 1.6987),
-    "Ductile Iron": (1.0434, 66.0815, 1.6726),
-    "Galvanized Iron": (1.2914, 25.9335, 1.4309),
-    "Copper": (1.0903, 44.1999, 1.6471)
-}
-
-# Define a namedtuple to represent a water main record (immutable, readable)
-WaterMain = namedtuple(
-    "WaterMain",
-    ["MainType", "Diameter", "InstallDate", "Material", "Age", "Survival_Probability"]
-)
-
-# List to store all water main records
-water_mains_table = []
+# Import the vectorized survival scoring and the compact water main table
+# score_survival(ages, materials, coefficients) returns the survival probability of every pipe as a percentage
+from pipe_survival import LazyInstallDate, SurvivalRiskAggregator, WaterMainTable, score_survival, simulate_failures
+
+# The coefficients dictionary fitted (or loaded from the cache) in Task 1 maps each material to its Weibull
+# parameters (acts as a material-to-parameter lookup table)
 
 # Path to the CSV file containing water main data
 csv_path = '/Users/jasonklein/Downloads/Water_Mains.csv'
 
+# Columns collected from the CSV so every pipe can be scored in one batch
+main_types = []
+diameters = []
+install_dates = []
+materials = []
+ages = []
+
 # Open and read the CSV file
 with open(csv_path, newline='', encoding="windows-1252") as csvfile:
     reader = csv.DictReader(csvfile)  # Read rows as dictionaries
@@ -142,61 +81,46 @@ with open(csv_path, newline='', encoding="windows-1252") as csvfile:
         if "ï»¿MainType" in row:
             row["MainType"] = row.pop("ï»¿MainType")
 
-        # Parse the installation date string into a datetime object ("5/29/2015 3:45:00 PM" → datetime.datetime(2015, 5, 29, 15, 45)
-        install_date = datetime.strptime(row["InstallDate"], "%m/%d/%Y %H:%M")
-        material = row["Material"]
+        # Wrap the installation date string so it is only parsed into a datetime object when needed
+        # ("5/29/2015 15:45" → datetime.datetime(2015, 5, 29, 15, 45)); the year is read straight from the string
+        install_date = LazyInstallDate(row["InstallDate"])
 
+        main_types.append(row["MainType"])
+        diameters.append(row["Diameter"])
+        install_dates.append(install_date.text)
+        materials.append(row["Material"])
         # Calculate age in years
-        age = current_year - install_date.year
-
-        # Calculate survival probability using material-specific coefficients
-        if material in coefficients:
-            c, b, a = coefficients[material]
-            survival = weibull_survival(age, c, b, a)
-            # Cap survival probability at 100% because can't have >100% chance of survival
-            if survival > 100:
-                survival = 100
-        else:
-            survival = None  # If material not in dictionary, set to None
-
-        # Create a WaterMain namedtuple instance for this pipe
-        wm = WaterMain(
-            MainType=row["MainType"],
-            Diameter=row["Diameter"],
-            InstallDate=install_date,
-            Material=material,
-            Age=age,
-            Survival_Probability=round(survival, 3) if survival is not None else None
-        )
-
-        # Add to the table
-        water_mains_table.append(wm)
+        ages.append(current_year - install_date.year)
 
-# Print first 5 rows to verify data
-for row in water_mains_table[:5]:
-    print(row)
+# Store all water main records in a compact column table: materials and main types become small integer codes,
+# diameters, ages and survival probabilities numeric arrays. Indexing it gives WaterMain namedtuples
+# (MainType, Diameter, InstallDate, Material, Age, Survival_Probability), with None for unscored pipes
+water_mains_table = WaterMainTable.from_columns(main_types, diameters, install_dates, materials, ages)
 
-# TASK 3
+# Calculate survival probabilities using material-specific coefficients: ages 0-200 are looked up in a table
+# precomputed once per material from the coefficients, capped at 100% (NaN if material not in dictionary)
+survival_column = np.round(score_survival(water_mains_table.age, water_mains_table.material_codes, coefficients,
+                                          categories=water_mains_table.materials), 3)
+water_mains_table.survival = survival_column.astype(np.float32)
 
-# Extract survival probabilities from the water mains table (excluding None values)
-survival_values = [
-    row.Survival_Probability
-    for row in water_mains_table
-    if row.Survival_Probability is not None
-]
-
-# Define threshold for "low survival" (below 70% is considered vulnerable)
+# Define thresholds for "low survival" (below 70% is considered vulnerable; 50% and 90% give context)
 threshold = 70
+risk_thresholds = [50, threshold, 90]
 
-# Filter list for pipes with survival probability below threshold
-low_survival = [v for v in survival_values if v < threshold]
+# Count the scored pipes into 15 fixed histogram bins and below each threshold as they are scored,
+# so Task 3 doesn't need a list of every survival value
+risk = SurvivalRiskAggregator(thresholds=risk_thresholds, bins=15)
+risk.add_batch(survival_column)
 
-# Calculate percentage of pipes below threshold (at risk); what proportion of the system is at risk?
-percent_low = (len(low_survival) / len(survival_values)) * 100
+# Print first 5 rows to verify data
+for row in water_mains_table[:5]:
+    print(row)
 
-# Create a histogram of survival probabilities
+# TASK 3
+
+# Create a histogram of survival probabilities from the bin counts collected in Task 2
 plt.figure(figsize=(8, 5))
-plt.hist(survival_values, bins=15, color='skyblue', edgecolor='black')
+plt.hist(risk.bin_edges[:-1], bins=risk.bin_edges, weights=risk.bin_counts, color='skyblue', edgecolor='black')
 # Add a vertical line at the threshold
 plt.axvline(threshold, color='red', linestyle='--', label=f'{threshold}% threshold')
 
@@ -208,8 +132,16 @@ plt.legend()
 plt.grid(axis='y', alpha=0.3)
 plt.show()
 
-# Print summary statistics
-print(f"Pipes below {threshold}% survival: {len(low_survival)} ({percent_low:.1f}% of total)")
+# Print summary statistics: how many pipes fall below each threshold and what proportion of the system is at risk
+for risk_threshold, (low_count, percent_low) in risk.results().items():
+    print(f"Pipes below {risk_threshold}% survival: {low_count} ({percent_low:.1f}% of total)")
+
+# Forecast pipe failures for each year of a 30-year capital plan: 1000 Monte Carlo trials draw a failure year for every
+# pipe from its material's Weibull curve (given its current age), giving the expected failures and a 90% band per year
+forecast = simulate_failures(water_mains_table.age, water_mains_table.material_codes, coefficients, years=30,
+                             trials=1000, confidence=0.9, seed=current_year, categories=water_mains_table.materials)
+for year, mean, lower, upper in zip(forecast.Year, forecast.Mean, forecast.Lower, forecast.Upper):
+    print(f"{current_year + year}: {mean:.1f} expected failures (90% band {lower:.0f}-{upper:.0f})")
 
 """
 Based on the histogram of pipe survival probabilities for Mercator Water, the utility does not appear to be vulnerable to 
@@ -0,0 +1,131 @@
+import argparse
+import math
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+
+from pipe_survival import load_training_data
+
+# Materials in the training workbook with rough (c, b, a) Weibull coefficients for the synthetic curves
+SYNTHETIC_MATERIALS = {
+    "Cast Iron": (1.02, 91, 1.7),
+    "Ductile Iron": (1.04, 66, 1.67),
+    "Galvanized Iron": (1.29, 26, 1.43),
+    "Copper": (1.09, 44, 1.65),
+}
+
+
+def write_training_workbook(path, rows_per_material, extra_sheets=3, seed=0):
+    """
+    Writes a synthetic Pipe_Material_Training_Data.xlsx.
+
+    Besides the "Survival Probabilities" sheet, the workbook gets a few
+    unrelated sheets of the same size, like a real workbook with notes and
+    pivots, which a full load has to parse as well.
+
+    Args:
+        path (str or Path): The workbook to write.
+        rows_per_material (int): The number of training rows per material.
+        extra_sheets (int): The number of unrelated sheets to add.
+        seed (int): The random seed, so runs are reproducible.
+    """
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+
+    sheet = workbook.create_sheet("Survival Probabilities")
+    sheet.append(["Material Type", "Life Expectancy", "Survival Percentage"])
+    for material, (c, b, a) in SYNTHETIC_MATERIALS.items():
+        for _ in range(rows_per_material):
+            life = rng.uniform(0, 120)
+            survival = min(100.0, c * math.exp(-((life / b) ** a)) * 100 + rng.uniform(-1, 1))
+            sheet.append([material, life, survival])
+
+    for index in range(extra_sheets):
+        other = workbook.create_sheet(f"Notes {index + 1}")
+        for row in range(rows_per_material * len(SYNTHETIC_MATERIALS)):
+            other.append([row, rng.random(), f"note {row}"])
+
+    workbook.save(path)
+
+
+def load_full_workbook(path):
+    """
+    The original Task 1 loading: a full workbook load, then one scan of the sheet per material.
+    """
+    sheet = load_workbook(path)["Survival Probabilities"]
+    training_data = {}
+
+    for material in SYNTHETIC_MATERIALS:
+        ages, failures = [], []
+        for mat, life, surv in sheet.iter_rows(values_only=True):
+            if mat == "Material Type":
+                continue
+            if mat == material and float(life) > 0:
+                ages.append(float(life))
+                failures.append(1 - float(surv) / 100)
+        training_data[material] = (np.array(ages), np.array(failures))
+
+    return training_data
+
+
+def measure(loader, path):
+    """
+    Runs a loader and returns its result, elapsed seconds and peak traced memory in bytes.
+
+    Tracing slows openpyxl down considerably, so the time comes from an
+    untraced run and the memory from a second, traced one.
+    """
+    start = time.perf_counter()
+    result = loader(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    loader(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark_training_load(rows_per_material):
+    """
+    Compares the full workbook load against the read-only streaming loader.
+
+    Both loaders must produce the same per-material arrays.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "Pipe_Material_Training_Data.xlsx"
+        write_training_workbook(path, rows_per_material)
+
+        full_data, full_time, full_peak = measure(load_full_workbook, path)
+        stream_data, stream_time, stream_peak = measure(load_training_data, path)
+
+    for material in SYNTHETIC_MATERIALS:
+        for full_column, stream_column in zip(full_data[material], stream_data[material]):
+            if not np.array_equal(full_column, stream_column):
+                raise AssertionError(f"The loaders produced different training data for {material}")
+
+    print(f"{'Rows/material':>14} {'Loader':<22} {'Seconds':>9} {'Peak MB':>9}")
+    print(f"{rows_per_material:>14,} {'full load + 4 scans':<22} {full_time:>9.2f} {full_peak / 2 ** 20:>9.1f}")
+    print(f"{rows_per_material:>14,} {'read-only stream':<22} {stream_time:>9.2f} {stream_peak / 2 ** 20:>9.1f}")
+    print(f"Speedup: {full_time / stream_time:.1f}x, memory: {full_peak / stream_peak:.1f}x less")
+
+
+def main():
+    """
+    Benchmarks loading the Week 9 pipe material training workbook.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__.strip())
+    parser.add_argument('rows', nargs='?', type=int, default=10000,
+                        help="training rows per material (default: 10000)")
+    args = parser.parse_args()
+
+    benchmark_training_load(args.rows)
+
+
+if __name__ == "__main__":
+    main()
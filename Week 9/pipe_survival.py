@@ -0,0 +1,726 @@
+import hashlib
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache, total_ordering
+from pathlib import Path
+
+import numpy as np
+from openpyxl import load_workbook
+from scipy.optimize import curve_fit
+
+
+# Format of the InstallDate column in Water_Mains.csv
+INSTALL_DATE_FORMAT = "%m/%d/%Y %H:%M"
+
+# One water main record; WaterMainTable returns its rows in this form
+WaterMain = namedtuple(
+    "WaterMain",
+    ["MainType", "Diameter", "InstallDate", "Material", "Age", "Survival_Probability"]
+)
+
+# Precomputed survival probabilities (%) indexed by (material code, integer age), from survival_lookup
+SurvivalLookup = namedtuple('SurvivalLookup', ['Materials', 'Max_Age', 'Table'])
+
+# Expected failures per plan year with a confidence band, from simulate_failures
+FailureForecast = namedtuple('FailureForecast', ['Year', 'Mean', 'Lower', 'Upper', 'Trial_Counts'])
+
+# Bump when the fitting setup (model, initial guess, iteration limit) changes so cached coefficients are refit
+FIT_VERSION = 1
+
+
+def cumulative_density_function(x, c, b, a):
+    """
+    Calculates the Weibull failure probability (CDF) at age x.
+
+    The training data provides survival percentages, but curve fitting needs
+    failure probabilities, so they are converted as Failure = 1 - Survival
+    (e.g. a survival of 95% is a failure probability of 5%).
+
+    Args:
+        x (float or np.ndarray): The pipe age(s) in years.
+        c (float): The initial survival multiplier (vertical scaling).
+        b (float): The scale parameter (controls lifespan length).
+        a (float): The shape parameter (controls curve steepness).
+
+    Returns:
+        float or np.ndarray: The failure probability by age x.
+    """
+    return 1 - c * np.exp(-((x / b) ** a))
+
+
+def weibull_survival(age, c, b, a):
+    """
+    Computes the Weibull survival probability as a percentage.
+
+    Works on a single age or on a NumPy array of ages, so a whole group of
+    pipes can be scored in one vectorized call.
+
+    Args:
+        age (float or np.ndarray): The pipe age(s) in years.
+        c (float): The initial survival multiplier.
+        b (float): The scale parameter.
+        a (float): The shape parameter.
+
+    Returns:
+        float or np.ndarray: The survival probability (%) for each age.
+    """
+    return c * np.exp(-((age / b) ** a)) * 100
+
+
+def survival_lookup(coefficients, max_age=200):
+    """
+    Returns the survival lookup table for a set of coefficients.
+
+    The table holds the capped survival probability of every material at
+    every integer age from 0 to max_age. Tables are cached on a snapshot of
+    the coefficients, so repeated calls reuse the same table and changing
+    any coefficient automatically builds a new one.
+
+    Args:
+        coefficients (dict): A dictionary mapping each material to its
+            fitted (c, b, a) coefficients.
+        max_age (int): The oldest age in the table.
+
+    Returns:
+        SurvivalLookup: The materials (indexed by row), max_age and the
+        read-only (material, age) table.
+    """
+    snapshot = tuple((material, tuple(float(coeff) for coeff in coeffs)) for material, coeffs in coefficients.items())
+    return _build_survival_lookup(snapshot, max_age)
+
+
+@lru_cache(maxsize=8)
+def _build_survival_lookup(snapshot, max_age):
+    ages = np.arange(max_age + 1, dtype=np.float64)
+    table = np.empty((len(snapshot), max_age + 1))
+    for row, (_, (c, b, a)) in enumerate(snapshot):
+        table[row] = weibull_survival(ages, c, b, a)
+    np.minimum(table, 100, out=table)
+
+    # The table is shared between callers, so make sure nobody modifies it
+    table.flags.writeable = False
+    return SurvivalLookup(tuple(material for material, _ in snapshot), max_age, table)
+
+
+def score_survival(ages, materials, coefficients, categories=None):
+    """
+    Scores a batch of pipes with their material's Weibull survival model.
+
+    Integer ages within the survival_lookup table are scored with an array
+    gather per material; any other age is evaluated with a vectorized
+    weibull_survival call. Either way the result is capped at 100% because
+    there can't be a greater than 100% chance of survival.
+
+    Args:
+        ages (sequence): The age of each pipe in years.
+        materials (sequence): The material of each pipe, or its integer
+            code into categories if categories is given.
+        coefficients (dict): A dictionary mapping each material to its
+            fitted (c, b, a) coefficients.
+        categories (list): The material names indexed by code, for
+            materials that are already dictionary-encoded (as by
+            encode_categories), which avoids a Python-level pass over them.
+
+    Returns:
+        np.ndarray: The survival probability (%) of each pipe, with NaN for
+        pipes whose material has no coefficients.
+    """
+    ages = np.asarray(ages, dtype=np.float64)
+    survival = np.full(len(ages), np.nan)
+
+    # Row of each pipe's material in the lookup table (-1 if it has no coefficients)
+    lookup = survival_lookup(coefficients)
+    material_rows = {material: row for row, material in enumerate(lookup.Materials)}
+    if categories is not None:
+        category_rows = np.array([material_rows.get(material, -1) for material in categories], dtype=np.intp)
+        codes = category_rows[np.asarray(materials, dtype=np.intp)]
+    else:
+        codes = np.fromiter((material_rows.get(material, -1) for material in materials), dtype=np.intp,
+                            count=len(ages))
+
+    in_table = (codes >= 0) & (ages >= 0) & (ages <= lookup.Max_Age) & (ages == np.floor(ages))
+    survival[in_table] = lookup.Table[codes[in_table], ages[in_table].astype(np.intp)]
+
+    computed = (codes >= 0) & ~in_table
+    for code in np.unique(codes[computed]):
+        in_group = computed & (codes == code)
+        c, b, a = coefficients[lookup.Materials[code]]
+        survival[in_group] = np.minimum(weibull_survival(ages[in_group], c, b, a), 100)
+
+    return survival
+
+
+def read_training_data(sheet):
+    """
+    Reads the survival training data for every material in one pass over the sheet.
+
+    Survival percentages are converted to failure probabilities (CDF values)
+    because that is what the curve fit models. Rows with a non-positive life
+    expectancy are skipped.
+
+    Args:
+        sheet (iterable): The "Survival Probabilities" worksheet, or any
+            object with an iter_rows(values_only=True) method yielding
+            (material, life expectancy, survival %) rows.
+
+    Returns:
+        dict: A dictionary mapping each material to a tuple of its ages and
+        failure probabilities as NumPy arrays.
+    """
+    rows_by_material = {}
+
+    for mat, life, surv in (row[:3] for row in sheet.iter_rows(values_only=True)):
+        # Skip the header row and blank rows (read-only sheets can report trailing empty rows)
+        if mat == "Material Type" or mat is None:
+            continue
+        if float(life) <= 0:
+            continue
+
+        ages, failures = rows_by_material.setdefault(mat, ([], []))
+        ages.append(float(life))
+        failures.append(1 - float(surv) / 100)
+
+    return {
+        material: (np.array(ages), np.array(failures))
+        for material, (ages, failures) in rows_by_material.items()
+    }
+
+
+def load_training_data(path, sheet_name="Survival Probabilities"):
+    """
+    Streams the survival training data out of the workbook.
+
+    The workbook is opened read-only, so openpyxl parses only the requested
+    sheet's rows as they are iterated instead of building the whole workbook
+    in memory first.
+
+    Args:
+        path (str or Path): The training data workbook.
+        sheet_name (str): The sheet holding the (material, life expectancy,
+            survival %) rows.
+
+    Returns:
+        dict: The per-material arrays from read_training_data.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return read_training_data(workbook[sheet_name])
+    finally:
+        # Read-only workbooks keep the file open until closed
+        workbook.close()
+
+
+def fit_material(x_train, y_train):
+    """
+    Fits the Weibull CDF to one material's training data.
+
+    Args:
+        x_train (np.ndarray): The pipe ages.
+        y_train (np.ndarray): The failure probabilities at those ages.
+
+    Returns:
+        tuple: The fitted (c, b, a) coefficients.
+    """
+    # Handle case where all Y values are identical (e.g., Copper data)
+    # Add small noise to allow curve fitting
+    if np.all(y_train == y_train[0]):
+        y_train = y_train + 0.001 * np.arange(len(y_train))
+
+    coeffs, _ = curve_fit(
+        cumulative_density_function,
+        x_train,
+        y_train,
+        p0=[1, 50, 2],  # Initial guess for c, b, a
+        maxfev=20000
+    )
+    return tuple(float(coeff) for coeff in coeffs)
+
+
+def fit_all_materials(training_data, max_workers=None):
+    """
+    Fits every material's Weibull model in parallel.
+
+    The fits run on a thread pool, like simulate_failures (curve_fit spends
+    most of its time in NumPy and MINPACK), so no worker processes are
+    started and the assignment script needs no __main__ guard.
+
+    Args:
+        training_data (dict): The output of read_training_data.
+        max_workers (int): The maximum number of worker threads.
+
+    Returns:
+        dict: A dictionary mapping each material to its fitted (c, b, a).
+    """
+    materials = list(training_data)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fits = executor.map(fit_material, [training_data[material][0] for material in materials],
+                            [training_data[material][1] for material in materials])
+        return dict(zip(materials, fits))
+
+
+def training_data_hash(training_data):
+    """
+    Returns a SHA-256 hex digest of the training data and the fitting setup.
+    """
+    digest = hashlib.sha256(f"fit-v{FIT_VERSION}".encode())
+    for material in sorted(training_data):
+        x_train, y_train = training_data[material]
+        digest.update(material.encode())
+        digest.update(np.ascontiguousarray(x_train, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(y_train, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def load_coefficients(training_data, cache_path, max_workers=None):
+    """
+    Returns fitted Weibull coefficients, refitting only when the training data changes.
+
+    The coefficients are stored as JSON together with a hash of the training
+    data they were fitted on. If the cached hash matches, the coefficients
+    are returned without fitting; otherwise every material is refit with
+    fit_all_materials and the cache is rewritten.
+
+    Args:
+        training_data (dict): The output of read_training_data.
+        cache_path (str or Path): The coefficient cache file.
+        max_workers (int): The maximum number of fitting threads.
+
+    Returns:
+        dict: A dictionary mapping each material to its (c, b, a) coefficients.
+    """
+    cache_path = Path(cache_path)
+    data_hash = training_data_hash(training_data)
+
+    try:
+        cached = json.loads(cache_path.read_text())
+        if cached["training_hash"] == data_hash:
+            return {material: tuple(coeffs) for material, coeffs in cached["coefficients"].items()}
+    except (OSError, ValueError, KeyError):
+        # Missing or unreadable cache: refit
+        pass
+
+    coefficients = fit_all_materials(training_data, max_workers)
+
+    # Write to a temporary file first so an interrupted write never leaves a partial cache
+    temp_path = cache_path.with_name(cache_path.name + '.tmp')
+    temp_path.write_text(json.dumps({"training_hash": data_hash, "coefficients": coefficients}, indent=2))
+    os.replace(temp_path, cache_path)
+
+    return coefficients
+
+
+def parse_install_year(text):
+    """
+    Extracts the year from an InstallDate string without parsing the full date.
+
+    Args:
+        text (str): A date string such as "5/29/2015 15:45".
+
+    Returns:
+        int: The year (2015).
+    """
+    return int(text.rpartition('/')[2].partition(' ')[0])
+
+
+@lru_cache(maxsize=65536)
+def parse_install_date(text):
+    """
+    Parses an InstallDate string into a datetime, caching each unique string.
+    """
+    return datetime.strptime(text, INSTALL_DATE_FORMAT)
+
+
+@total_ordering
+class LazyInstallDate:
+    """
+    Install date that is only parsed into a datetime when it is needed.
+
+    The year (all that the age calculation uses) is read straight from the
+    string. Any other attribute (month, strftime, ...) and comparisons
+    materialize the datetime through parse_install_date, and the repr is the
+    datetime's, so printed rows look the same as with an eager datetime.
+    """
+
+    __slots__ = ('text', '_value')
+
+    def __init__(self, text):
+        self.text = text
+        self._value = None
+
+    @property
+    def year(self):
+        if self._value is not None:
+            return self._value.year
+        return parse_install_year(self.text)
+
+    @property
+    def value(self):
+        """
+        Returns the install date as a datetime, parsing it on first use.
+        """
+        if self._value is None:
+            self._value = parse_install_date(self.text)
+        return self._value
+
+    def __getattr__(self, name):
+        # Private and special names aren't delegated (this also keeps copy and pickle from recursing)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    def __repr__(self):
+        return repr(self.value)
+
+    def __str__(self):
+        return str(self.value)
+
+    @staticmethod
+    def _comparable(other):
+        if isinstance(other, LazyInstallDate):
+            return other.value
+        return other if isinstance(other, datetime) else NotImplemented
+
+    def __eq__(self, other):
+        other = self._comparable(other)
+        return NotImplemented if other is NotImplemented else self.value == other
+
+    def __lt__(self, other):
+        other = self._comparable(other)
+        return NotImplemented if other is NotImplemented else self.value < other
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class SurvivalRiskAggregator:
+    """
+    Streaming histogram and threshold counts for survival probabilities.
+
+    Bin counts and below-threshold counts are updated as pipes are scored,
+    so the risk summary and histogram never need a list of every survival
+    value. Aggregators built over separate chunks can be merged.
+    """
+
+    def __init__(self, thresholds=(70,), bins=15, value_range=(0, 100)):
+        self.thresholds = tuple(thresholds)
+        self.bin_edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        self.bin_counts = np.zeros(bins, dtype=np.int64)
+        self.below_counts = dict.fromkeys(self.thresholds, 0)
+        self.count = 0
+
+    def add(self, value):
+        """
+        Updates the counts with one survival probability (None is skipped).
+        """
+        if value is None or np.isnan(value):
+            return
+        self.count += 1
+
+        # Bins are half-open except the last one, which includes the upper edge (as in np.histogram)
+        index = int(np.searchsorted(self.bin_edges, value, side='right')) - 1
+        if value == self.bin_edges[-1]:
+            index -= 1
+        if 0 <= index < len(self.bin_counts):
+            self.bin_counts[index] += 1
+
+        for threshold in self.thresholds:
+            if value < threshold:
+                self.below_counts[threshold] += 1
+
+    def add_batch(self, values):
+        """
+        Updates the counts with an array of survival probabilities (NaN is skipped).
+
+        Returns:
+            SurvivalRiskAggregator: This aggregator, to allow chaining.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+
+        self.bin_counts += np.histogram(values, bins=self.bin_edges)[0]
+        for threshold in self.thresholds:
+            self.below_counts[threshold] += int(np.count_nonzero(values < threshold))
+        return self
+
+    def merge(self, other):
+        """
+        Folds the counts of another aggregator with the same bins and thresholds into this one.
+
+        Returns:
+            SurvivalRiskAggregator: This aggregator, to allow chaining.
+        """
+        if other.thresholds != self.thresholds or not np.array_equal(other.bin_edges, self.bin_edges):
+            raise ValueError("Can only merge aggregators with the same bins and thresholds")
+
+        self.count += other.count
+        self.bin_counts += other.bin_counts
+        for threshold in self.thresholds:
+            self.below_counts[threshold] += other.below_counts[threshold]
+        return self
+
+    def percent_below(self, threshold):
+        """
+        Returns the percentage of scored pipes below a threshold (0 if none were scored).
+        """
+        return self.below_counts[threshold] / self.count * 100 if self.count else 0.0
+
+    def results(self):
+        """
+        Returns the number of pipes below each threshold and their percentage of the total.
+
+        Returns:
+            dict: A dictionary mapping each threshold to a (count, percent) tuple.
+        """
+        return {
+            threshold: (self.below_counts[threshold], self.percent_below(threshold))
+            for threshold in self.thresholds
+        }
+
+
+def _simulate_trial_block(pipes, seed_sequence, trials, years, chunk_size):
+    """
+    Simulates a block of trials over every pipe, one chunk of pipes at a time.
+
+    Each pipe's remaining life is drawn by inverting its Weibull survival
+    curve conditioned on having survived to its current age: with U uniform
+    on [0, 1), the pipe fails at the age t where S(t) = U * S(age).
+
+    Args:
+        pipes (tuple): The ages, current survival probabilities and c, b and
+            a coefficients of the simulated pipes, as NumPy arrays.
+        seed_sequence (np.random.SeedSequence): The block's seed.
+        trials (int): The number of trials in the block.
+        years (int): The length of the plan in years.
+        chunk_size (int): The number of pipes simulated at once.
+
+    Returns:
+        np.ndarray: The number of failures in each (trial, plan year).
+    """
+    ages, survival, c, b, a = pipes
+    rng = np.random.default_rng(seed_sequence)
+    failure_counts = np.zeros(trials * years, dtype=np.int64)
+    trial_offsets = (np.arange(trials) * years)[:, np.newaxis]
+
+    for start in range(0, len(ages), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        age, current_survival, c_chunk, b_chunk, a_chunk = ages[chunk], survival[chunk], c[chunk], b[chunk], a[chunk]
+
+        target_survival = rng.random((trials, len(age))) * current_survival
+
+        with np.errstate(divide='ignore'):
+            failure_age = b_chunk * (-np.log(target_survival / c_chunk)) ** (1 / a_chunk)
+        # Plan year (1-based) in which the pipe fails; pipes already past the end of their curve fail in year 1
+        failure_year = np.maximum(np.ceil(failure_age - age), 1)
+        failure_year[:, current_survival == 0] = 1
+
+        in_plan = failure_year <= years
+        flat_index = (trial_offsets + failure_year.astype(np.int64) - 1)[in_plan]
+        failure_counts += np.bincount(flat_index, minlength=trials * years)
+
+    return failure_counts.reshape(trials, years)
+
+
+def simulate_failures(ages, materials, coefficients, years=30, trials=1000, confidence=0.9, seed=None,
+                      chunk_size=20000, trials_per_task=50, max_workers=None, categories=None):
+    """
+    Monte Carlo simulation of pipe failures per year over a capital plan.
+
+    Every trial draws a failure time for each pipe from its material's
+    Weibull model, conditioned on the pipe's current age, and counts the
+    failures in each plan year. Trials are split into blocks that run on a
+    thread pool (the NumPy work releases the GIL), and pipes are processed
+    in chunks, so memory stays at about trials_per_task * chunk_size values
+    per worker instead of the full trials x pipes matrix. Each block gets
+    its own seed spawned from the master seed, so for a given seed,
+    trials_per_task and chunk_size the results are reproducible regardless
+    of max_workers.
+
+    Args:
+        ages (sequence): The current age of each pipe in years.
+        materials (sequence): The material of each pipe (pipes whose
+            material has no coefficients are not simulated).
+        coefficients (dict): A dictionary mapping each material to its
+            fitted (c, b, a) coefficients.
+        years (int): The length of the plan in years.
+        trials (int): The number of Monte Carlo trials.
+        confidence (float): The width of the confidence band (0.9 gives
+            the 5th to 95th percentile).
+        seed (int): The master random seed.
+        chunk_size (int): The number of pipes simulated at once.
+        trials_per_task (int): The number of trials per thread task.
+        max_workers (int): The maximum number of worker threads.
+        categories (list): The material names indexed by code, if materials
+            are already dictionary-encoded.
+
+    Returns:
+        FailureForecast: The plan years, the mean, lower and upper number of
+        failures in each year, and the per-trial failure counts.
+    """
+    ages = np.asarray(ages, dtype=np.float64)
+    if categories is None:
+        codes, categories = encode_categories(materials)
+    else:
+        codes = np.asarray(materials, dtype=np.intp)
+
+    # Per-pipe coefficients, keeping only pipes with a known material
+    category_coefficients = np.array([coefficients.get(material, (np.nan,) * 3) for material in categories],
+                                     dtype=np.float64).reshape(-1, 3)
+    c, b, a = category_coefficients[codes].T
+    known = ~np.isnan(c)
+
+    # Probability of each pipe having survived to its current age, from the lookup table
+    current_survival = score_survival(ages[known], codes[known], coefficients, categories=categories) / 100
+    pipes = (ages[known], current_survival, c[known], b[known], a[known])
+
+    block_sizes = [min(trials_per_task, trials - start) for start in range(0, trials, trials_per_task)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(block_sizes))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        blocks = list(executor.map(
+            _simulate_trial_block, [pipes] * len(block_sizes), seed_sequences, block_sizes,
+            [years] * len(block_sizes), [chunk_size] * len(block_sizes)
+        ))
+    trial_counts = np.concatenate(blocks) if blocks else np.zeros((0, years), dtype=np.int64)
+
+    tail = (1 - confidence) / 2 * 100
+    return FailureForecast(
+        Year=np.arange(1, years + 1),
+        Mean=trial_counts.mean(axis=0),
+        Lower=np.percentile(trial_counts, tail, axis=0),
+        Upper=np.percentile(trial_counts, 100 - tail, axis=0),
+        Trial_Counts=trial_counts
+    )
+
+
+def encode_categories(values):
+    """
+    Dictionary-encodes a sequence of values into small integer codes.
+
+    Codes are assigned in order of first appearance, so the same input always
+    gets the same codes.
+
+    Args:
+        values (iterable): The values to encode (e.g. material names).
+
+    Returns:
+        tuple: The codes as a NumPy array of the smallest unsigned integer
+        type that fits, and the list of categories indexed by code.
+    """
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64)
+    return codes.astype(np.min_scalar_type(max(len(index) - 1, 0))), list(index)
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class WaterMainTable:
+    """
+    Column-oriented table of water mains.
+
+    Instead of one namedtuple per pipe (string fields and a datetime, hundreds
+    of bytes each), every field is a NumPy column: MainType and Material are
+    dictionary-encoded into small integer codes, Diameter is float32, Age is
+    int16, Survival_Probability is float32 (NaN for None) and install dates
+    are fixed-width bytes. Columns can be filtered with vectorized
+    operations, and indexing or iterating yields WaterMain rows.
+    """
+
+    def __init__(self, main_type_codes, main_types, diameter, install_dates, material_codes, materials, age,
+                 survival):
+        self.main_type_codes = main_type_codes
+        self.main_types = main_types
+        self.diameter = diameter
+        self.install_dates = install_dates
+        self.material_codes = material_codes
+        self.materials = materials
+        self.age = age
+        self.survival = survival
+
+    @classmethod
+    def from_columns(cls, main_types, diameters, install_dates, materials, ages, survival=None):
+        """
+        Builds a table from per-pipe column sequences.
+
+        Args:
+            main_types (sequence): The MainType of each pipe.
+            diameters (sequence): The Diameter of each pipe, as numbers or
+                strings (unparseable values become NaN).
+            install_dates (sequence): The InstallDate string of each pipe.
+            materials (sequence): The Material of each pipe.
+            ages (sequence): The age of each pipe in years.
+            survival (sequence): The survival probability of each pipe (NaN
+                or None if it wasn't scored); defaults to all unscored.
+
+        Returns:
+            WaterMainTable: The new table.
+        """
+        main_type_codes, main_type_names = encode_categories(main_types)
+        material_codes, material_names = encode_categories(materials)
+        if survival is None:
+            survival = np.full(len(ages), np.nan, dtype=np.float32)
+        else:
+            survival = np.array([np.nan if value is None else value for value in survival], dtype=np.float32)
+
+        return cls(
+            main_type_codes, main_type_names,
+            np.array([_to_float(value) for value in diameters], dtype=np.float32),
+            np.array([str(value).encode('ascii') for value in install_dates], dtype=np.bytes_),
+            material_codes, material_names,
+            np.asarray(ages, dtype=np.int16),
+            survival
+        )
+
+    def __len__(self):
+        return len(self.age)
+
+    def row(self, index):
+        """
+        Returns one pipe as a WaterMain namedtuple.
+        """
+        survival = float(self.survival[index])
+        return WaterMain(
+            MainType=self.main_types[self.main_type_codes[index]],
+            Diameter=float(self.diameter[index]),
+            InstallDate=LazyInstallDate(self.install_dates[index].decode('ascii')),
+            Material=self.materials[self.material_codes[index]],
+            Age=int(self.age[index]),
+            # float32 keeps about 7 significant digits, so rounding restores the 3-decimal value
+            Survival_Probability=None if np.isnan(survival) else round(survival, 3)
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("WaterMainTable index out of range")
+        return self.row(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def material_mask(self, material):
+        """
+        Returns a boolean array marking the pipes of one material.
+        """
+        if material not in self.materials:
+            return np.zeros(len(self), dtype=bool)
+        return self.material_codes == self.materials.index(material)
+
+    def nbytes(self):
+        """
+        Returns the memory used by the table's columns in bytes.
+        """
+        return sum(column.nbytes for column in (self.main_type_codes, self.diameter, self.install_dates,
+                                                 self.material_codes, self.age, self.survival))